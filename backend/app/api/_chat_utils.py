@@ -0,0 +1,384 @@
+"""
+Shared helpers for the chat endpoints.
+
+Session resolution, history loading, message building and persistence are used
+by both the regular and the streaming chat handlers.
+"""
+from fastapi import HTTPException, Response, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import InsertOne, ReturnDocument
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import itertools
+
+from cachetools import TTLCache
+
+from app.models.chat import ChatMessage, MessageRole
+from app.core.config import settings
+from app.core.serialization import clean_metadata
+
+# Projections: fetch only the fields the handlers read
+SESSION_PROJECTION = {
+    "_id": 0,
+    "session_id": 1,
+    "user_id": 1,
+    "title": 1,
+    "updated_at": 1,
+    "message_count": 1,
+}
+MESSAGE_PROJECTION = {
+    "_id": 0,
+    "message_id": 1,
+    "session_id": 1,
+    "role": 1,
+    "content": 1,
+    "timestamp": 1,
+    "sources": 1,
+}
+
+# Number of retrieved sources stored with (and returned for) each assistant message
+MAX_SOURCES = 3
+
+# Short-lived per-worker cache of session documents, keyed by session_id
+_session_cache: TTLCache = TTLCache(
+    maxsize=settings.SESSION_CACHE_SIZE, ttl=settings.SESSION_CACHE_TTL
+)
+
+
+def clean_source(src: dict) -> dict:
+    """Convert a retrieved source into a JSON-safe dict (non-primitive metadata is stringified)."""
+    return {
+        "id": str(src.get("id", "")),
+        "score": float(src.get("score", 0.0)),
+        "text": str(src.get("text", "")),
+        "metadata": clean_metadata(src.get("metadata") or {}),
+    }
+
+
+def serialize_sources(
+    sources: Optional[Iterable[dict]], cap: int = MAX_SOURCES
+) -> List[Dict[str, Any]]:
+    """Serialize at most `cap` sources; anything past the cap is never touched."""
+    return [clean_source(src) for src in itertools.islice(sources or (), cap)]
+
+
+def to_chat_message(msg: dict) -> ChatMessage:
+    """
+    Build a ChatMessage from a stored message document, fixing legacy fields.
+    Stored documents were validated on write, so validation is skipped here.
+    """
+    # Handle legacy sources (list of IDs) vs new format (list of dicts)
+    if msg.get("sources") and isinstance(msg["sources"][0], str):
+        msg["sources"] = []
+
+    # Ensure timestamp is timezone-aware (MongoDB may return timezone-naive)
+    if msg.get("timestamp") and msg["timestamp"].tzinfo is None:
+        msg["timestamp"] = msg["timestamp"].replace(tzinfo=timezone.utc)
+
+    # Restore the enum that validation would have produced from the stored string
+    msg["role"] = MessageRole(msg["role"])
+
+    return ChatMessage.model_construct(**msg)
+
+
+async def get_session(
+    db: AsyncIOMotorDatabase, sid: str, use_cache: bool = True
+) -> Optional[dict]:
+    """
+    Fetch a session document, served from the in-process cache when possible.
+
+    The cache is per worker, so a cached document may lag behind a delete or a
+    promotion done by another worker for up to SESSION_CACHE_TTL seconds; pass
+    use_cache=False wherever that matters.
+
+    Args:
+        db: Database handle
+        sid: Session ID
+        use_cache: Whether a cached document may be returned
+
+    Returns:
+        Session document, or None if it doesn't exist
+    """
+    session_doc = _session_cache.get(sid) if use_cache else None
+    if session_doc is None:
+        session_doc = await db.sessions.find_one(
+            {"session_id": sid},
+            SESSION_PROJECTION,
+            max_time_ms=settings.MONGODB_MAX_TIME_MS,
+        )
+        # Missing sessions are not cached so a freshly created one is seen right away
+        if session_doc is not None:
+            _session_cache[sid] = session_doc
+    return session_doc
+
+
+async def get_authorized_session(
+    db: AsyncIOMotorDatabase, sid: str, user_id: Optional[str], detail: str
+) -> dict:
+    """
+    Fetch a session and check that the user may access it.
+
+    A cached document is only trusted to grant access: a miss or a denial is
+    re-checked against the database, since another worker may have promoted
+    the session to this user in the meantime.
+
+    Args:
+        db: Database handle
+        sid: Session ID
+        user_id: Authenticated user ID (None for anonymous users)
+        detail: Error detail for the 403 response
+
+    Returns:
+        Session document
+    """
+    session_doc = await get_session(db, sid)
+    if session_doc is None or (user_id and session_doc.get("user_id") != user_id):
+        session_doc = await get_session(db, sid, use_cache=False)
+
+    if not session_doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+        )
+
+    # Check authorization for authenticated users
+    if user_id and session_doc.get("user_id") != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    return session_doc
+
+
+def invalidate_session(sid: str):
+    """Drop a session from the cache after it was modified or deleted."""
+    _session_cache.pop(sid, None)
+
+
+# Environment-aware cookie settings, resolved once at import:
+# - Development: secure=False, samesite="lax" (for localhost-only testing)
+# - Production: secure=True, samesite="none" (for cross-origin: localhost → AWS)
+_IS_PRODUCTION = settings.ENVIRONMENT == "production"
+_SESSION_COOKIE_KWARGS = {
+    "key": settings.ANONYMOUS_SESSION_COOKIE_NAME,
+    "max_age": settings.ANONYMOUS_SESSION_MAX_AGE,
+    "httponly": True,
+    "secure": _IS_PRODUCTION,
+    "samesite": "none" if _IS_PRODUCTION else "lax",
+}
+
+
+def _set_session_cookie(response: Response, session_id: str, user_id: Optional[str]):
+    """Set the session cookie on a response for anonymous users."""
+    if not user_id:
+        response.set_cookie(value=session_id, **_SESSION_COOKIE_KWARGS)
+
+
+async def resolve_or_create_session(
+    db: AsyncIOMotorDatabase,
+    response: Response,
+    session_id: str,
+    user_id: Optional[str],
+) -> dict:
+    """
+    Fetch a chat session, creating it if it doesn't exist yet.
+
+    Args:
+        db: Database handle
+        response: Response to attach the anonymous session cookie to
+        session_id: Session ID to look up or create
+        user_id: Authenticated user ID (None for anonymous users)
+
+    Returns:
+        Session document
+    """
+    # Always asks the database: this is the write path, and a cached document may
+    # be stale if another worker deleted or promoted the session meanwhile.
+    # Fetch the session, creating it if it doesn't exist, in a single round trip.
+    # Only $setOnInsert is used, so existing sessions are left untouched and
+    # returning the document *before* the update tells the two cases apart.
+    now = datetime.now(timezone.utc)
+    defaults = {
+        "user_id": user_id,  # Will be None for anonymous, user_id for authenticated
+        "created_at": now,
+        "updated_at": now,
+        "title": None,
+        "message_count": 0,
+    }
+    session_doc = await db.sessions.find_one_and_update(
+        {"session_id": session_id},
+        {"$setOnInsert": defaults},
+        projection=SESSION_PROJECTION,
+        upsert=True,
+        return_document=ReturnDocument.BEFORE,
+        maxTimeMS=settings.MONGODB_MAX_TIME_MS,
+    )
+
+    if session_doc is None:
+        # Session was just created
+        session_doc = {"session_id": session_id, **defaults}
+        _session_cache[session_id] = session_doc
+        _set_session_cookie(response, session_id, user_id)
+        return session_doc
+
+    # Check authorization
+    if user_id and session_doc.get("user_id") != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this session",
+        )
+
+    # Sessions predating the counter get it before persist_turn increments it
+    if session_doc.get("message_count") is None:
+        session_doc["message_count"] = await ensure_message_count(db, session_id)
+
+    _session_cache[session_id] = session_doc
+    return session_doc
+
+
+async def ensure_message_count(db: AsyncIOMotorDatabase, sid: str) -> int:
+    """
+    Store the message counter of a session created before it existed.
+
+    The write only applies while the counter is still missing, so it never
+    overwrites a counter stored (and incremented) by another request.
+
+    Args:
+        db: Database handle
+        sid: Session ID
+
+    Returns:
+        Number of messages in the session
+    """
+    message_count = await db.messages.count_documents(
+        {"session_id": sid}, maxTimeMS=settings.MONGODB_MAX_TIME_MS
+    )
+    result = await db.sessions.update_one(
+        {"session_id": sid, "message_count": {"$exists": False}},
+        {"$set": {"message_count": message_count}},
+    )
+    if not result.matched_count:
+        # Another request stored it first; that value wins
+        session_doc = await db.sessions.find_one(
+            {"session_id": sid},
+            {"_id": 0, "message_count": 1},
+            max_time_ms=settings.MONGODB_MAX_TIME_MS,
+        )
+        message_count = (session_doc or {}).get("message_count", message_count)
+    invalidate_session(sid)
+    return message_count
+
+
+async def load_history(
+    db: AsyncIOMotorDatabase, sid: str, limit: int = 10
+) -> List[ChatMessage]:
+    """
+    Load the most recent messages of a session in chronological order.
+
+    Args:
+        db: Database handle
+        sid: Session ID
+        limit: Maximum number of messages to load
+
+    Returns:
+        List of ChatMessage objects, oldest first
+    """
+    recent_messages = (
+        await db.messages.find({"session_id": sid}, MESSAGE_PROJECTION)
+        .sort([("timestamp", -1), ("_id", -1)])
+        .limit(limit)
+        .max_time_ms(settings.MONGODB_MAX_TIME_MS)
+        .to_list(length=limit)
+    )
+    return [to_chat_message(msg) for msg in reversed(recent_messages)]
+
+
+def build_turn(
+    sid: str, user_content: str, assistant_content: str, sources: List[Dict[str, Any]]
+) -> Tuple[ChatMessage, ChatMessage, List[Dict[str, Any]]]:
+    """
+    Build the user and assistant messages of a chat turn.
+
+    Args:
+        sid: Session ID
+        user_content: User message text
+        assistant_content: Assistant response text
+        sources: Retrieved documents used for the response
+
+    Returns:
+        Tuple of (user message, assistant message, serialized sources)
+    """
+    # Ensure user message timestamp is before assistant; offset by 1ms because
+    # MongoDB stores datetimes with millisecond precision
+    user_timestamp = datetime.now(timezone.utc)
+    assistant_timestamp = user_timestamp + timedelta(milliseconds=1)
+
+    # Serialize sources properly to avoid recursion errors
+    serialized_sources = serialize_sources(sources)
+
+    user_message = ChatMessage(
+        session_id=sid,
+        role=MessageRole.USER,
+        content=user_content,
+        timestamp=user_timestamp,
+    )
+    assistant_message = ChatMessage(
+        session_id=sid,
+        role=MessageRole.ASSISTANT,
+        content=assistant_content,
+        timestamp=assistant_timestamp,
+        sources=serialized_sources,
+    )
+    return user_message, assistant_message, serialized_sources
+
+
+async def persist_turn(
+    db: AsyncIOMotorDatabase,
+    sid: str,
+    user_id: Optional[str],
+    user_msg: ChatMessage,
+    assistant_msg: ChatMessage,
+    title: Optional[str],
+):
+    """
+    Persist a chat turn: insert its messages and update the session metadata.
+    Uses a transaction when enabled (replica set required), otherwise runs both writes concurrently.
+
+    The session update upserts, so a turn racing a delete on another worker
+    recreates its session instead of leaving messages without one.
+    """
+    # Unordered bulk insert: both messages go out in one command and neither
+    # blocks the other on error
+    message_ops = [InsertOne(user_msg.model_dump()), InsertOne(assistant_msg.model_dump())]
+    # resolve_or_create_session already stored the counter of sessions predating it,
+    # so $inc never creates the field on an existing session (only on a re-created one)
+    session_update = {
+        "$set": {"updated_at": assistant_msg.timestamp, "title": title},
+        "$inc": {"message_count": 2},
+        "$setOnInsert": {"user_id": user_id, "created_at": user_msg.timestamp},
+    }
+
+    if settings.MONGODB_USE_TRANSACTIONS:
+        async with await db.client.start_session() as mongo_session:
+            async with mongo_session.start_transaction():
+                await db.messages.bulk_write(
+                    message_ops, ordered=False, session=mongo_session
+                )
+                await db.sessions.update_one(
+                    {"session_id": sid}, session_update, upsert=True, session=mongo_session
+                )
+    else:
+        await asyncio.gather(
+            db.messages.bulk_write(message_ops, ordered=False),
+            db.sessions.update_one({"session_id": sid}, session_update, upsert=True),
+        )
+
+    # Write the update through to the cached session (legacy sessions without a
+    # stored counter are dropped instead, so the next read sees the real document)
+    cached = _session_cache.get(sid)
+    if cached is not None:
+        if cached.get("message_count") is None:
+            invalidate_session(sid)
+        else:
+            _session_cache[sid] = {
+                **cached,
+                **session_update["$set"],
+                "message_count": cached["message_count"] + 2,
+            }
@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from app.services.vector_store import vector_store_service
 from app.api.dependencies import get_current_user_id
 from typing import List, Dict, Any, Optional
+import asyncio
+import itertools
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -21,11 +23,8 @@ async def list_all_documents(
             detail="Authentication required for admin endpoints"
         )
     try:
-        if not vector_store_service.index:
-            vector_store_service.initialize_index()
-
         # Get index statistics
-        stats = vector_store_service.get_index_stats()
+        stats = await asyncio.to_thread(vector_store_service.get_index_stats)
 
         response = {
             "index_name": vector_store_service.index_name,
@@ -61,9 +60,6 @@ async def search_all_documents(
             detail="Authentication required for admin endpoints"
         )
     try:
-        if not vector_store_service.index:
-            vector_store_service.initialize_index()
-
         # Use a generic query to get diverse results
         queries = [
             "account registration",
@@ -73,19 +69,20 @@ async def search_all_documents(
             "technical support"
         ]
 
-        all_results = []
-        seen_ids = set()
+        # Embed all queries in one request and run the searches in parallel
+        results_lists = await vector_store_service.search_similar_batch(
+            queries=queries,
+            top_k=limit // len(queries)
+        )
 
-        for query in queries:
-            results = await vector_store_service.search_similar(
-                query=query,
-                top_k=limit // len(queries)
-            )
+        # Merge results, keeping the best score for documents matched by several queries
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for result in itertools.chain.from_iterable(results_lists):
+            prev = by_id.get(result["id"])
+            if prev is None or result["score"] > prev["score"]:
+                by_id[result["id"]] = result
 
-            for result in results:
-                if result["id"] not in seen_ids:
-                    seen_ids.add(result["id"])
-                    all_results.append(result)
+        all_results = sorted(by_id.values(), key=lambda r: r["score"], reverse=True)[:limit]
 
         return {
             "total_found": len(all_results),
@@ -113,10 +110,7 @@ async def get_index_stats(
             detail="Authentication required for admin endpoints"
         )
     try:
-        if not vector_store_service.index:
-            vector_store_service.initialize_index()
-
-        stats = vector_store_service.get_index_stats()
+        stats = await asyncio.to_thread(vector_store_service.get_index_stats)
 
         # Convert stats to a serializable dictionary
         stats_dict = {
@@ -1,11 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 import uuid
 
 from app.db.mongodb import get_database
+from app.core.config import settings
 from app.models.user import UserCreate, UserLogin, TokenResponse
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
+from app.api._chat_utils import invalidate_session
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -18,9 +25,11 @@ async def register(
     """
     Register a new user.
     """
-    # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
+    # Reject known emails before paying for the hash (the unique index below
+    # still catches concurrent registrations)
+    if await db.users.find_one(
+        {"email": user_data.email}, {"_id": 1}, max_time_ms=settings.MONGODB_MAX_TIME_MS
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -28,16 +37,25 @@ async def register(
 
     # Create user
     user_id = str(uuid.uuid4())
+    # Hashing is CPU- and memory-bound; run it on the bounded hashing executor
+    hashed_password = await get_password_hash_async(user_data.password)
     user_doc = {
         "user_id": user_id,
         "email": user_data.email,
-        "hashed_password": get_password_hash(user_data.password),
+        "hashed_password": hashed_password,
         "full_name": user_data.full_name,
         "created_at": datetime.utcnow(),
         "is_active": True
     }
 
-    await db.users.insert_one(user_doc)
+    # The unique index on email rejects duplicates atomically, even under concurrent registration
+    try:
+        await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     # Create access token
     access_token = create_access_token(data={"sub": user_id, "email": user_data.email})
@@ -58,15 +76,18 @@ async def login(
     Login with email and password.
     """
     # Find user
-    user = await db.users.find_one({"email": credentials.email})
+    user = await db.users.find_one(
+        {"email": credentials.email}, max_time_ms=settings.MONGODB_MAX_TIME_MS
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
-    # Verify password
-    if not verify_password(credentials.password, user["hashed_password"]):
+    # Verify password (CPU-bound; run it on the bounded hashing executor)
+    password_ok = await verify_password_async(credentials.password, user["hashed_password"])
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -105,7 +126,7 @@ async def promote_anonymous_session(
     session = await db.sessions.find_one({
         "session_id": session_id,
         "user_id": None
-    })
+    }, max_time_ms=settings.MONGODB_MAX_TIME_MS)
 
     if not session:
         return {"message": "No anonymous session found"}
@@ -115,5 +136,6 @@ async def promote_anonymous_session(
         {"session_id": session_id},
         {"$set": {"user_id": user_id}}
     )
+    invalidate_session(session_id)
 
     return {"message": "Session promoted successfully"}
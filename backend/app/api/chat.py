@@ -1,26 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Cookie
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, Cookie
 from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import datetime, timezone
-from typing import Optional
+from bson import ObjectId
+from pydantic import BaseModel
+from datetime import timezone
+from typing import AsyncGenerator, Dict, List, Optional
+import asyncio
+import orjson
 import uuid
 
 from app.db.mongodb import get_database
 from app.models.chat import (
     ChatRequest,
     ChatResponse,
-    ChatMessage,
-    Message,
-    MessageRole,
     SessionListResponse,
     SessionMessagesResponse,
 )
 from app.services.chat_service import chat_service
 from app.api.dependencies import get_current_user_id, get_session_id
+from app.api._chat_utils import (
+    MESSAGE_PROJECTION,
+    SESSION_PROJECTION,
+    build_turn,
+    ensure_message_count,
+    get_authorized_session,
+    get_session,
+    invalidate_session,
+    load_history,
+    persist_turn,
+    resolve_or_create_session,
+    to_chat_message,
+)
 from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Server-sent event framing (payloads are pre-encoded bytes, no per-chunk str encoding)
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = _SSE_PREFIX + orjson.dumps({"type": "done"}) + _SSE_SUFFIX
+
+# Paginated message reads also need _id, which doubles as the page cursor
+_PAGE_PROJECTION = {**MESSAGE_PROJECTION, "_id": 1}
+
 
 @router.post("", response_model=ChatResponse)
 async def send_message(
@@ -48,141 +73,51 @@ async def send_message(
         # Anonymous user - use cookie
         session_id = request.session_id or session_id_cookie or str(uuid.uuid4())
 
-    # Create new session if it doesn't exist in database
-    existing_session = await db.sessions.find_one({"session_id": session_id})
-    if not existing_session:
-        session_doc = {
-            "session_id": session_id,
-            "user_id": user_id,  # Will be None for anonymous, user_id for authenticated
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-            "title": None,
-        }
-        await db.sessions.insert_one(session_doc)
-
-        # Set session cookie for anonymous users
-        if not user_id:
-            # Environment-aware cookie settings:
-            # - Development: secure=False, samesite="lax" (for localhost-only testing)
-            # - Production: secure=True, samesite="none" (for cross-origin: localhost → AWS)
-            is_production = settings.ENVIRONMENT == "production"
-            response.set_cookie(
-                key=settings.ANONYMOUS_SESSION_COOKIE_NAME,
-                value=session_id,
-                max_age=settings.ANONYMOUS_SESSION_MAX_AGE,
-                httponly=True,
-                secure=is_production,
-                samesite="none" if is_production else "lax",
-            )
-    else:
-        # Verify session exists and belongs to user
-        session_doc = await db.sessions.find_one({"session_id": session_id})
-        if not session_doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
-            )
-
-        # Check authorization
-        if user_id and session_doc.get("user_id") != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to access this session",
-            )
-
-    # Get recent conversation history (last 10 messages for AI context)
-    recent_messages = (
-        await db.messages.find({"session_id": session_id})
-        .sort([("timestamp", -1), ("_id", -1)])
-        .limit(10)
-        .to_list(length=10)
-    )
-
-    # Reverse to get chronological order and handle legacy source format
-    conversation_history = []
-    for msg in reversed(recent_messages):
-        # Handle legacy sources (list of IDs) vs new format (list of dicts)
-        if msg.get("sources") and isinstance(msg["sources"][0], str):
-            msg["sources"] = []
-
-        # Ensure timestamp is timezone-aware (MongoDB may return timezone-naive)
-        if msg.get("timestamp") and msg["timestamp"].tzinfo is None:
-            msg["timestamp"] = msg["timestamp"].replace(tzinfo=timezone.utc)
+    # Start RAG retrieval right away; it only needs the user message
+    retrieval_task = asyncio.create_task(chat_service.retrieve_context(request.message))
 
-        conversation_history.append(ChatMessage(**msg))
+    # Resolve the session and load recent conversation history (last 10 messages for AI context) concurrently
+    try:
+        session_doc, conversation_history = await asyncio.gather(
+            resolve_or_create_session(db, response, session_id, user_id),
+            load_history(db, session_id),
+        )
+    except BaseException:
+        # Don't leave retrieval running (and spending API calls) for a failed request
+        retrieval_task.cancel()
+        raise
 
     # Generate AI response with RAG
     ai_response, sources = await chat_service.generate_response(
-        user_message=request.message, conversation_history=conversation_history
+        user_message=request.message,
+        conversation_history=conversation_history,
+        retrieved_docs=await retrieval_task,
     )
 
-    # Create messages with IDs (ensure user message timestamp is before assistant)
-    user_timestamp = datetime.now(timezone.utc)
-    user_message = ChatMessage(
-        session_id=session_id,
-        role=MessageRole.USER,
-        content=request.message,
-        timestamp=user_timestamp,
-    )
-
-    # Serialize sources properly to avoid recursion errors
-    serialized_sources = []
-    for src in sources[:3]:
-        # Clean metadata to ensure JSON serialization
-        clean_metadata = {}
-        raw_metadata = src.get("metadata", {})
-        for k, v in raw_metadata.items():
-            if isinstance(v, (str, int, float, bool, type(None))):
-                clean_metadata[k] = v
-            else:
-                clean_metadata[k] = str(v)
-
-        serialized_sources.append(
-            {
-                "id": str(src.get("id", "")),
-                "score": float(src.get("score", 0.0)),
-                "text": str(src.get("text", "")),
-                "metadata": clean_metadata,
-            }
-        )
-
-    assistant_timestamp = datetime.now(timezone.utc)
-    assistant_message = ChatMessage(
-        session_id=session_id,
-        role=MessageRole.ASSISTANT,
-        content=ai_response,
-        timestamp=assistant_timestamp,
-        sources=serialized_sources,
+    user_message, assistant_message, serialized_sources = build_turn(
+        session_id, request.message, ai_response, sources
     )
 
     # Generate title for new sessions
-    session_doc = await db.sessions.find_one({"session_id": session_id})
     title = session_doc.get("title")
     if not title and len(conversation_history) == 0:
         title = await chat_service.generate_session_title(request.message)
 
-    # Insert messages to messages collection
-    await db.messages.insert_many([user_message.dict(), assistant_message.dict()])
-
-    # Update session metadata (title and timestamp only)
-    await db.sessions.update_one(
-        {"session_id": session_id},
-        {"$set": {"updated_at": assistant_timestamp, "title": title}},
-    )
+    # Insert messages and update session metadata (title and timestamp only)
+    await persist_turn(db, session_id, user_id, user_message, assistant_message, title)
 
-    # Use Pydantic for proper serialization with clean data
-    response = ChatResponse(
+    # FastAPI serializes via response_model (timezone-aware datetimes auto-include TZ)
+    return ChatResponse(
         session_id=session_id,
         message=assistant_message,
         sources=serialized_sources,
     )
 
-    # Use Pydantic's JSON-safe serialization (timezone-aware datetimes auto-include TZ)
-    return response.model_dump(mode="json")
-
 
 @router.post("/stream")
 async def send_message_stream(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     user_id: Optional[str] = Depends(get_current_user_id),
     session_id_cookie: Optional[str] = Cookie(
         None, alias=settings.ANONYMOUS_SESSION_COOKIE_NAME
@@ -193,7 +128,10 @@ async def send_message_stream(
     Send a message and get streaming AI response.
     Session ID priority: 1) Request body, 2) Cookie, 3) Generate new
     """
-    print(f"[DEBUG] POST /chat/stream - user_id: {user_id}, request.session_id: {request.session_id}, cookie: {session_id_cookie}")
+    logger.debug(
+        "POST /chat/stream - user_id: %s, request.session_id: %s, cookie: %s",
+        user_id, request.session_id, session_id_cookie,
+    )
 
     # Get session_id:
     # - For authenticated users: Use request.session_id or generate new (ignore cookie)
@@ -205,120 +143,54 @@ async def send_message_stream(
         # Anonymous user - use cookie
         session_id = request.session_id or session_id_cookie or str(uuid.uuid4())
 
-    print(f"[DEBUG] Using session_id: {session_id}")
-
-    # Track if we need to set a new cookie
-    should_set_cookie = False
-
-    # Create new session if it doesn't exist in database
-    session_doc = await db.sessions.find_one({"session_id": session_id})
-    if not session_doc:
-        print(f"[DEBUG] Creating new session with session_id: {session_id}, user_id: {user_id}")
-        session_doc = {
-            "session_id": session_id,
-            "user_id": user_id,  # Will be None for anonymous, user_id for authenticated
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-            "title": None,
-        }
-        await db.sessions.insert_one(session_doc)
-        print(f"[DEBUG] Session created successfully")
-
-        # Mark that we need to set cookie (only for anonymous users)
-        if not user_id:
-            should_set_cookie = True
-    else:
-        print(f"[DEBUG] Found existing session: {session_doc.get('session_id')}, user_id: {session_doc.get('user_id')}")
-
-    # Get recent conversation history (last 10 messages for AI context)
-    recent_messages = (
-        await db.messages.find({"session_id": session_id})
-        .sort([("timestamp", -1), ("_id", -1)])
-        .limit(10)
-        .to_list(length=10)
-    )
-
-    # Reverse to get chronological order and handle legacy source format
-    conversation_history = []
-    for msg in reversed(recent_messages):
-        # Handle legacy sources (list of IDs) vs new format (list of dicts)
-        if msg.get("sources") and isinstance(msg["sources"][0], str):
-            msg["sources"] = []
-
-        # Ensure timestamp is timezone-aware (MongoDB may return timezone-naive)
-        if msg.get("timestamp") and msg["timestamp"].tzinfo is None:
-            msg["timestamp"] = msg["timestamp"].replace(tzinfo=timezone.utc)
-
-        conversation_history.append(ChatMessage(**msg))
-
-    # Get session for title check
-    session_doc = await db.sessions.find_one({"session_id": session_id})
-
-    # Stream response
-    async def generate_stream():
-        import json
-
-        # Send session_id first (proper JSON format)
-        yield f"data: {json.dumps({'session_id': session_id})}\n\n"
-
-        full_response = ""
-        sources = []
-
-        async for chunk in chat_service.generate_response_stream(
-            user_message=request.message, conversation_history=conversation_history
-        ):
-            yield f"data: {chunk}\n\n"
-
-            # Parse and collect data for database
-            try:
-                data = json.loads(chunk.strip())
-                if data.get("type") == "content":
-                    full_response += data["data"]
-                elif data.get("type") == "sources":
-                    sources = data["data"]
-            except json.JSONDecodeError:
-                pass
-
-        # Signal stream completion
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
-
-        # After streaming completes, save to database (ensure user timestamp is before assistant)
-        user_timestamp = datetime.now(timezone.utc)
-        user_message = ChatMessage(
-            session_id=session_id,
-            role=MessageRole.USER,
-            content=request.message,
-            timestamp=user_timestamp,
-        )
-
-        # Serialize sources properly to avoid recursion errors
-        serialized_sources = []
-        for src in sources[:3] if sources else []:
-            # Clean metadata to ensure JSON serialization
-            clean_metadata = {}
-            raw_metadata = src.get("metadata", {})
-            for k, v in raw_metadata.items():
-                if isinstance(v, (str, int, float, bool, type(None))):
-                    clean_metadata[k] = v
-                else:
-                    clean_metadata[k] = str(v)
-
-            serialized_sources.append(
-                {
-                    "id": str(src.get("id", "")),
-                    "score": float(src.get("score", 0.0)),
-                    "text": str(src.get("text", "")),
-                    "metadata": clean_metadata,
-                }
-            )
-
-        assistant_timestamp = datetime.now(timezone.utc)
-        assistant_message = ChatMessage(
-            session_id=session_id,
-            role=MessageRole.ASSISTANT,
-            content=full_response,
-            timestamp=assistant_timestamp,
-            sources=serialized_sources,
+    logger.debug("Using session_id: %s", session_id)
+
+    # Start RAG retrieval right away; it only needs the user message
+    retrieval_task = asyncio.create_task(chat_service.retrieve_context(request.message))
+
+    # Filled in by the stream and saved once the response has been sent
+    full_response = ""
+    sources = []
+    completed = False
+
+    # Stream response (the generator body only runs once the response is sent,
+    # after the session and history below have been resolved)
+    async def generate_stream() -> AsyncGenerator[bytes, None]:
+        nonlocal full_response, sources, completed
+
+        try:
+            # Send session_id first (proper JSON format)
+            yield _SSE_PREFIX + orjson.dumps({"session_id": session_id}) + _SSE_SUFFIX
+
+            async for event_type, data in chat_service.generate_response_stream(
+                user_message=request.message,
+                conversation_history=conversation_history,
+                retrieved_docs=await retrieval_task,
+            ):
+                yield _SSE_PREFIX + orjson.dumps({"type": event_type, "data": data}) + _SSE_SUFFIX
+
+                # Collect data for database
+                if event_type == "content":
+                    full_response += data
+                elif event_type == "sources":
+                    sources = data
+
+            # Signal stream completion
+            yield _SSE_DONE
+            completed = True
+        finally:
+            # Client disconnected before retrieval finished
+            retrieval_task.cancel()
+
+    async def save_turn():
+        # Runs after the response is closed; skipped if the client disconnected mid-stream
+        if not completed:
+            # The stream may never have started, leaving retrieval running
+            retrieval_task.cancel()
+            return
+
+        user_message, assistant_message, _ = build_turn(
+            session_id, request.message, full_response, sources
         )
 
         title = session_doc.get("title")
@@ -327,40 +199,79 @@ async def send_message_stream(
                 request.message if user_id else "Nonauthenticated messages"
             )
 
-        # Insert messages to messages collection
-        await db.messages.insert_many([user_message.dict(), assistant_message.dict()])
+        # Insert messages and update session metadata (title and timestamp only)
+        await persist_turn(db, session_id, user_id, user_message, assistant_message, title)
 
-        # Update session metadata (title and timestamp only)
-        await db.sessions.update_one(
-            {"session_id": session_id},
-            {"$set": {"updated_at": assistant_timestamp, "title": title}},
-        )
-
-    # Prepare headers for streaming response
-    headers = {
-        "Cache-Control": "no-cache",
-        "Connection": "keep-alive",
-        "X-Accel-Buffering": "no",  # Disable buffering in nginx/proxies
-    }
-
-    # Set cookie header if needed (for anonymous users with new sessions)
-    if should_set_cookie:
-        is_production = settings.ENVIRONMENT == "production"
-        secure_flag = "; Secure" if is_production else ""
-        samesite_value = "None" if is_production else "Lax"
-        cookie_value = (
-            f"{settings.ANONYMOUS_SESSION_COOKIE_NAME}={session_id}; "
-            f"Max-Age={settings.ANONYMOUS_SESSION_MAX_AGE}; "
-            f"Path=/; HttpOnly{secure_flag}; SameSite={samesite_value}"
-        )
-        headers["Set-Cookie"] = cookie_value
-
-    return StreamingResponse(
+    stream_response = StreamingResponse(
         generate_stream(),
         media_type="text/event-stream",
-        headers=headers,
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable buffering in nginx/proxies
+        },
+    )
+
+    # Resolve the session (sets the cookie for new anonymous sessions) and load
+    # recent conversation history (last 10 messages for AI context) concurrently
+    try:
+        session_doc, conversation_history = await asyncio.gather(
+            resolve_or_create_session(db, stream_response, session_id, user_id),
+            load_history(db, session_id),
+        )
+    except BaseException:
+        # Don't leave retrieval running (and spending API calls) for a failed request
+        retrieval_task.cancel()
+        raise
+
+    logger.debug(
+        "Resolved session: %s, user_id: %s",
+        session_doc.get("session_id"), session_doc.get("user_id"),
     )
 
+    # Persist the turn after the stream finishes so the connection isn't held open for DB writes
+    background_tasks.add_task(save_turn)
+
+    return stream_response
+
+
+def _model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes with pydantic-core, skipping
+    FastAPI's response_model re-validation (the model was just built from trusted data).
+    response_model is kept on the routes for the OpenAPI schema.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+async def _message_stats(db: AsyncIOMotorDatabase, session_ids: List[str]) -> Dict[str, dict]:
+    """Get message count and last message for every session in a single aggregation."""
+    if not session_ids:
+        return {}
+
+    pipeline = [
+        {"$match": {"session_id": {"$in": session_ids}}},
+        {"$sort": {"session_id": 1, "timestamp": -1}},
+        {
+            "$group": {
+                "_id": "$session_id",
+                "count": {"$sum": 1},
+                "last_message": {"$first": "$content"},
+            }
+        },
+        # Truncate the preview server-side so only 100 characters per session come back
+        {
+            "$project": {
+                "count": 1,
+                "last_message": {"$substrCP": ["$last_message", 0, 100]},
+            }
+        },
+    ]
+    stats = await db.messages.aggregate(
+        pipeline, maxTimeMS=settings.MONGODB_MAX_TIME_MS
+    ).to_list(length=len(session_ids))
+    return {stat["_id"]: stat for stat in stats}
+
 
 @router.get("/sessions", response_model=SessionListResponse)
 async def list_sessions(
@@ -372,35 +283,41 @@ async def list_sessions(
     List all sessions for the current user.
     For anonymous users, returns only their current session.
     """
-    # Debug logging
-    print(f"[DEBUG] GET /sessions - user_id: {user_id}, session_id: {session_id}")
+    logger.debug("GET /sessions - user_id: %s, session_id: %s", user_id, session_id)
 
     if user_id:
         # Authenticated user - return all their sessions
         sessions = (
-            await db.sessions.find({"user_id": user_id})
+            await db.sessions.find({"user_id": user_id}, SESSION_PROJECTION)
             .sort("updated_at", -1)
+            .max_time_ms(settings.MONGODB_MAX_TIME_MS)
             .to_list(length=100)
         )
-    else:
-        # Anonymous user - return only current session
+        message_stats = await _message_stats(
+            db, [session["session_id"] for session in sessions]
+        )
+    elif session_id:
+        # Anonymous user - return only current session; its ID is already known,
+        # so fetch the session and its message stats concurrently
         query = {"session_id": session_id}
-        print(f"[DEBUG] Anonymous user query: {query}")
-        sessions = await db.sessions.find(query).to_list(length=1)
-        print(f"[DEBUG] Found {len(sessions)} sessions")
+        logger.debug("Anonymous user query: %s", query)
+        sessions, message_stats = await asyncio.gather(
+            db.sessions.find(query, SESSION_PROJECTION)
+            .max_time_ms(settings.MONGODB_MAX_TIME_MS)
+            .to_list(length=1),
+            _message_stats(db, [session_id]),
+        )
+        logger.debug("Found %d sessions", len(sessions))
+    else:
+        sessions, message_stats = [], {}
 
     # Format response with message metadata from messages collection
     session_list = []
     for session in sessions:
         session_id = session["session_id"]
-
-        # Get message count
-        message_count = await db.messages.count_documents({"session_id": session_id})
-
-        # Get last message for preview
-        last_message_doc = await db.messages.find_one(
-            {"session_id": session_id}, sort=[("timestamp", -1)]
-        )
+        stat = message_stats.get(session_id)
+        message_count = stat["count"] if stat else 0
+        last_message = stat["last_message"] if stat else None
 
         # Ensure updated_at is timezone-aware (MongoDB may return timezone-naive)
         updated_at = session["updated_at"]
@@ -413,15 +330,12 @@ async def list_sessions(
                 "title": session.get("title") or "New Chat",
                 "updated_at": updated_at.isoformat(),
                 "message_count": message_count,
-                "last_message_preview": (
-                    last_message_doc["content"][:100] if last_message_doc else None
-                ),
+                "last_message_preview": last_message,
             }
         )
 
-    response = SessionListResponse(sessions=session_list)
-    print(f"[DEBUG] Returning {len(session_list)} sessions: {session_list}")
-    return response.model_dump(mode="json")
+    logger.debug("Returning %d sessions", len(session_list))
+    return _model_response(SessionListResponse(sessions=session_list))
 
 
 @router.get("/sessions/{session_id}/messages", response_model=SessionMessagesResponse)
@@ -437,36 +351,44 @@ async def get_session_messages(
 
     Args:
         limit: Number of messages to return (default: 50, max: 100)
-        cursor: Message ID to start from (for pagination)
+        cursor: Opaque cursor returned by the previous page (for pagination)
     """
     # Limit max page size
     limit = min(limit, 100)
 
-    session = await db.sessions.find_one({"session_id": session_id})
-
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
-        )
-
-    # Check authorization for authenticated users
-    if user_id and session.get("user_id") != user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this session",
-        )
+    session = await get_authorized_session(
+        db, session_id, user_id, "Not authorized to access this session"
+    )
 
     # Build query
     query = {"session_id": session_id}
     if cursor:
-        # Get messages after this cursor (older messages)
-        cursor_message = await db.messages.find_one({"message_id": cursor})
-        if cursor_message:
-            query["timestamp"] = {"$lt": cursor_message["timestamp"]}
+        # The cursor is the _id of the oldest message on the previous page
+        # (older clients may still send its message_id); get messages before it
+        cursor_filter = (
+            {"_id": ObjectId(cursor)} if ObjectId.is_valid(cursor) else {"message_id": cursor}
+        )
+        cursor_message = await db.messages.find_one(
+            {"session_id": session_id, **cursor_filter},
+            {"timestamp": 1},
+            max_time_ms=settings.MONGODB_MAX_TIME_MS,
+        )
+        if cursor_message is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query["$or"] = [
+            {"timestamp": {"$lt": cursor_message["timestamp"]}},
+            {"timestamp": cursor_message["timestamp"], "_id": {"$lt": cursor_message["_id"]}},
+        ]
 
-    # Fetch messages with pagination (sort by timestamp DESC, then _id DESC for consistent ordering)
+    # Fetch messages with pagination (sort by timestamp DESC, then _id DESC to break
+    # ties; ObjectIds from different workers aren't ordered within the same second)
     messages_cursor = (
-        db.messages.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(limit + 1)
+        db.messages.find(query, _PAGE_PROJECTION)
+        .sort([("timestamp", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .max_time_ms(settings.MONGODB_MAX_TIME_MS)
     )
     messages_list = await messages_cursor.to_list(length=limit + 1)
 
@@ -479,39 +401,27 @@ async def get_session_messages(
     messages_list.reverse()
 
     # Convert to ChatMessage objects, handling legacy source format
-    messages = []
-    for msg in messages_list:
-        # Handle legacy sources (list of IDs) vs new format (list of dicts)
-        if msg.get("sources"):
-            sources = msg["sources"]
-            # If sources are strings (legacy format), convert to empty list
-            # Frontend will handle this gracefully
-            if sources and isinstance(sources[0], str):
-                msg["sources"] = []
-
-        # Ensure timestamp is timezone-aware (MongoDB may return timezone-naive)
-        if msg.get("timestamp") and msg["timestamp"].tzinfo is None:
-            msg["timestamp"] = msg["timestamp"].replace(tzinfo=timezone.utc)
+    messages = [to_chat_message(msg) for msg in messages_list]
 
-        messages.append(ChatMessage(**msg))
-
-    # Get total count
-    total_count = await db.messages.count_documents({"session_id": session_id})
+    # Get total count from the session counter (count only sessions predating it,
+    # and store the result so the count runs once per legacy session)
+    total_count = session.get("message_count")
+    if total_count is None:
+        total_count = await ensure_message_count(db, session_id)
 
     # Next cursor
-    next_cursor = messages_list[0]["message_id"] if has_more and messages_list else None
+    next_cursor = str(messages_list[0]["_id"]) if has_more and messages_list else None
 
-    response = SessionMessagesResponse(
-        session_id=session_id,
-        messages=messages,
-        total_count=total_count,
-        has_more=has_more,
-        cursor=next_cursor,
+    return _model_response(
+        SessionMessagesResponse(
+            session_id=session_id,
+            messages=messages,
+            total_count=total_count,
+            has_more=has_more,
+            cursor=next_cursor,
+        )
     )
 
-    # Use Pydantic serialization (timezone-aware datetimes auto-include TZ)
-    return response.model_dump(mode="json")
-
 
 @router.delete("/sessions/{session_id}")
 async def delete_session(
@@ -520,9 +430,10 @@ async def delete_session(
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
     """
-    Delete a chat session.
+    Delete a chat session and its messages.
     """
-    session = await db.sessions.find_one({"session_id": session_id})
+    # Deleting is a write: check against the database, not the per-worker cache
+    session = await get_session(db, session_id, use_cache=False)
 
     if not session:
         raise HTTPException(
@@ -536,6 +447,21 @@ async def delete_session(
             detail="Not authorized to delete this session",
         )
 
-    await db.sessions.delete_one({"session_id": session_id})
+    # Delete the session together with its messages so none are left orphaned
+    if settings.MONGODB_USE_TRANSACTIONS:
+        async with await db.client.start_session() as mongo_session:
+            async with mongo_session.start_transaction():
+                await db.sessions.delete_one(
+                    {"session_id": session_id}, session=mongo_session
+                )
+                await db.messages.delete_many(
+                    {"session_id": session_id}, session=mongo_session
+                )
+    else:
+        await asyncio.gather(
+            db.sessions.delete_one({"session_id": session_id}),
+            db.messages.delete_many({"session_id": session_id}),
+        )
+    invalidate_session(session_id)
 
     return {"message": "Session deleted successfully"}
@@ -1,12 +1,48 @@
 from fastapi import Cookie, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
+from cachetools import TTLCache
 from app.core.security import verify_token
 from app.core.config import settings
+from app.core.logging_config import get_logger
+import time
 import uuid
 
+logger = get_logger(__name__)
+
 security = HTTPBearer(auto_error=False)
 
+# Verified tokens -> (user_id, exp); entries are also checked against the token's own expiry
+_token_cache: TTLCache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL
+)
+
+
+def _user_id_from_token(token: str) -> Optional[str]:
+    """
+    Verify a JWT and return its subject, reusing recent verifications.
+
+    Args:
+        token: Raw bearer token
+
+    Returns:
+        user_id from the token's "sub" claim (None if missing)
+
+    Raises:
+        HTTPException: If the token is invalid or expired
+    """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, exp = cached
+        if exp is None or time.time() < exp:
+            return user_id
+        del _token_cache[token]
+
+    payload = verify_token(token)
+    user_id = payload.get("sub")
+    _token_cache[token] = (user_id, payload.get("exp"))
+    return user_id
+
 
 async def get_current_user_id(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -15,22 +51,18 @@ async def get_current_user_id(
     Extract user_id from JWT token if present.
     Returns None for anonymous users.
     """
-    print(f"[DEBUG] get_current_user_id - credentials present: {credentials is not None}")
     if not credentials:
-        print("[DEBUG] get_current_user_id - No credentials, returning None")
+        logger.debug("get_current_user_id - No credentials, returning None")
         return None
 
     try:
-        print(f"[DEBUG] get_current_user_id - Token: {credentials.credentials[:20]}...")
-        payload = verify_token(credentials.credentials)
-        user_id = payload.get("sub")
-        print(f"[DEBUG] get_current_user_id - Extracted user_id: {user_id}")
+        user_id = _user_id_from_token(credentials.credentials)
+        logger.debug("get_current_user_id - Extracted user_id: %s", user_id)
         if not user_id:
-            print("[DEBUG] get_current_user_id - No user_id in payload, returning None")
             return None
         return user_id
     except HTTPException as e:
-        print(f"[DEBUG] get_current_user_id - HTTPException: {e.detail}")
+        logger.debug("get_current_user_id - HTTPException: %s", e.detail)
         return None
 
 
@@ -72,8 +104,7 @@ async def require_auth(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = verify_token(credentials.credentials)
-    user_id = payload.get("sub")
+    user_id = _user_id_from_token(credentials.credentials)
 
     if not user_id:
         raise HTTPException(
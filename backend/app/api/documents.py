@@ -2,15 +2,29 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional, List
 from pydantic import BaseModel
+from cachetools import TTLCache
+import asyncio
 
 from app.db.mongodb import get_database
-from app.services.vector_store import vector_store_service
+from app.services.vector_store import chunked, vector_store_service
 from app.services.embeddings import embedding_service
 from app.api.dependencies import require_auth
+from app.core.serialization import clean_metadata
 
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Document listings keyed by (namespace, limit, index write version)
+_documents_cache: TTLCache = TTLCache(maxsize=32, ttl=60)
+_documents_lock = asyncio.Lock()
+
+# Broad query used when the index can't be listed; its embedding is computed once
+_FALLBACK_QUERY = "financial services banking transfer payment"
+_fallback_embedding: Optional[List[float]] = None
+
+# Maximum number of IDs per Pinecone fetch request
+_FETCH_BATCH_SIZE = 1000
+
 
 class DocumentResponse(BaseModel):
     """Response model for a single document."""
@@ -38,84 +52,17 @@ async def list_documents(
     """
 
     try:
-        # Initialize index if needed
-        if not vector_store_service.index:
-            vector_store_service.initialize_index()
-
-        # Try to use Pinecone's list() API for efficient retrieval
-        all_documents = {}
-
-        try:
-            # Use list() to get vector IDs (more efficient than querying)
-            list_results = vector_store_service.index.list(namespace="")
-            vector_ids = []
-
-            # Collect IDs from list results
-            for id_item in list_results:
-                vector_ids.append(str(id_item))
-                if len(vector_ids) >= limit:
-                    break
-
-            # Fetch vectors by ID with metadata
-            if vector_ids:
-                fetch_results = vector_store_service.index.fetch(ids=vector_ids, namespace="")
-
-                for vector_id, vector_data in fetch_results.vectors.items():
-                    # Manually serialize metadata to avoid circular references
-                    clean_metadata = {}
-                    raw_metadata = vector_data.metadata or {}
-                    for k, v in raw_metadata.items():
-                        if k != "text":
-                            if isinstance(v, (str, int, float, bool, type(None))):
-                                clean_metadata[k] = v
-                            else:
-                                clean_metadata[k] = str(v)
-
-                    all_documents[vector_id] = {
-                        "id": str(vector_id),
-                        "score": 1.0,  # No relevance score for listing
-                        "text": str(raw_metadata.get("text", "")),
-                        "metadata": clean_metadata
-                    }
-
-        except (AttributeError, Exception) as e:
-            # Fallback: Use a single broad query if list() is not available
-            # Create a generic embedding for broad retrieval
-            query_embedding = await embedding_service.generate_embedding("financial services banking transfer payment")
-
-            results = vector_store_service.index.query(
-                vector=query_embedding,
-                top_k=min(limit, 1000),
-                include_metadata=True,
-                namespace=""
-            )
-
-            for match in results.matches:
-                # Manually serialize metadata to avoid circular references
-                clean_metadata = {}
-                for k, v in match.metadata.items():
-                    if k != "text":
-                        if isinstance(v, (str, int, float, bool, type(None))):
-                            clean_metadata[k] = v
-                        else:
-                            clean_metadata[k] = str(v)
-
-                all_documents[match.id] = {
-                    "id": str(match.id),
-                    "score": float(match.score),
-                    "text": str(match.metadata.get("text", "")),
-                    "metadata": clean_metadata
-                }
-
-        # Convert to list and sort by ID for consistency
-        documents = sorted(all_documents.values(), key=lambda x: x["id"])
-
-        # Use Pydantic for proper serialization with clean data
-        response = DocumentsListResponse(
-            total=len(documents),
-            documents=documents
-        )
-        return response.model_dump(mode='json')
+        # The corpus rarely changes; serve from the cache, and let only one
+        # request rebuild an expired entry while the others wait for it
+        cache_key = ("", limit, vector_store_service.write_version)
+        documents = _documents_cache.get(cache_key)
+        if documents is None:
+            async with _documents_lock:
+                documents = _documents_cache.get(cache_key)
+                if documents is None:
+                    documents = await _load_documents(limit)
+                    _documents_cache[cache_key] = documents
+        return documents
 
     except Exception as e:
         raise HTTPException(
@@ -124,6 +71,92 @@ async def list_documents(
         )
 
 
+def _list_vector_ids(limit: int) -> List[str]:
+    """Collect up to `limit` vector IDs from Pinecone's paginated list() API."""
+    vector_ids = []
+
+    # list() yields pages (lists of IDs); stop paging once enough are collected
+    for id_page in vector_store_service.index.list(namespace=""):
+        for vector_id in id_page:
+            vector_ids.append(vector_id)
+            if len(vector_ids) >= limit:
+                return vector_ids
+
+    return vector_ids
+
+
+async def _load_documents(limit: int) -> DocumentsListResponse:
+    """Fetch up to `limit` documents from Pinecone."""
+    # Try to use Pinecone's list() API for efficient retrieval
+    all_documents = {}
+
+    # Connect in a worker thread (no-op once connected), so the index property
+    # read below never runs a lazy connect on the event loop
+    await asyncio.to_thread(vector_store_service.initialize_index)
+
+    try:
+        # Use list() to get vector IDs (more efficient than querying)
+        # (Pinecone SDK calls block, so they run in worker threads)
+        vector_ids = await asyncio.to_thread(_list_vector_ids, limit)
+
+        # Fetch vectors by ID with metadata, in parallel batches of the Pinecone maximum
+        if vector_ids:
+            fetch_results = await asyncio.gather(*[
+                asyncio.to_thread(
+                    vector_store_service.index.fetch,
+                    ids=batch,
+                    namespace=""
+                )
+                for batch in chunked(vector_ids, _FETCH_BATCH_SIZE)
+            ])
+            vectors = {}
+            for fetch_result in fetch_results:
+                vectors.update(fetch_result.vectors)
+
+            for vector_id, vector_data in vectors.items():
+                # Manually serialize metadata to avoid circular references
+                raw_metadata = vector_data.metadata or {}
+                all_documents[vector_id] = {
+                    "id": str(vector_id),
+                    "score": 1.0,  # No relevance score for listing
+                    "text": str(raw_metadata.get("text", "")),
+                    "metadata": clean_metadata(raw_metadata)
+                }
+
+    except (AttributeError, Exception) as e:
+        # Fallback: Use a single broad query if list() is not available
+        # Create a generic embedding for broad retrieval (once per process)
+        global _fallback_embedding
+        if _fallback_embedding is None:
+            _fallback_embedding = await embedding_service.generate_embedding(_FALLBACK_QUERY)
+
+        results = await asyncio.to_thread(
+            vector_store_service.index.query,
+            vector=_fallback_embedding,
+            top_k=min(limit, 1000),
+            include_metadata=True,
+            namespace=""
+        )
+
+        for match in results.matches:
+            # Manually serialize metadata to avoid circular references
+            all_documents[match.id] = {
+                "id": str(match.id),
+                "score": float(match.score),
+                "text": str(match.metadata.get("text", "")),
+                "metadata": clean_metadata(match.metadata)
+            }
+
+    # Convert to list and sort by ID for consistency
+    documents = sorted(all_documents.values(), key=lambda x: x["id"])
+
+    # Use Pydantic for proper serialization with clean data
+    return DocumentsListResponse(
+        total=len(documents),
+        documents=documents
+    )
+
+
 @router.get("/stats")
 async def get_documents_stats(
     user_id: str = Depends(require_auth),
@@ -135,12 +168,8 @@ async def get_documents_stats(
     """
 
     try:
-        # Initialize index if needed
-        if not vector_store_service.index:
-            vector_store_service.initialize_index()
-
         # Get index stats (returns Pinecone object)
-        stats = vector_store_service.get_index_stats()
+        stats = await asyncio.to_thread(vector_store_service.get_index_stats)
 
         # Extract values directly from stats object before serialization
         total_vectors = 0
@@ -1,12 +1,18 @@
 """
 Enhanced health check endpoint for AWS ECS/ALB monitoring.
+
+Liveness probes (/health, /health/live) are answered by HealthCheckInterceptor
+before requests reach the router. Readiness is checked by a background task and
+the endpoint serves the latest snapshot.
 """
-from fastapi import APIRouter, status, Depends
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, Response, status
 from typing import Dict, Any
 from datetime import datetime, timezone
+import asyncio
+import orjson
 
-from app.db.mongodb import get_database
+from app.core.config import settings
+from app.db.mongodb import MongoDB
 from app.services.vector_store import vector_store_service
 from app.core.logging_config import get_logger
 
@@ -14,89 +20,98 @@ logger = get_logger(__name__)
 
 router = APIRouter(tags=["health"])
 
+# Latest readiness snapshot as (HTTP status, pre-serialized body); replaced
+# wholesale by the refresher, so readers never see a partial update.
+# Reports "starting" (503) until the first check.
+_health_snapshot = (
+    status.HTTP_503_SERVICE_UNAVAILABLE,
+    orjson.dumps({"status": "starting", "checks": {}}),
+)
+
+
+async def _mongo_check() -> Dict[str, Any]:
+    """Ping MongoDB, bounded by HEALTH_CHECK_TIMEOUT."""
+    await asyncio.wait_for(
+        MongoDB.get_db().command("ping"), timeout=settings.HEALTH_CHECK_TIMEOUT
+    )
+    logger.debug("MongoDB health check passed")
+    return {"status": "healthy", "message": "Connection successful"}
+
+
+async def _pinecone_check() -> Dict[str, Any]:
+    """Describe the Pinecone index, bounded by HEALTH_CHECK_TIMEOUT."""
+    index = vector_store_service.get_index()
+    if not index:
+        logger.warning("Pinecone health check failed: Index not initialized")
+        return {"status": "unhealthy", "message": "Index not initialized"}
+
+    # The SDK call blocks, so run it in a worker thread
+    stats = await asyncio.wait_for(
+        asyncio.to_thread(index.describe_index_stats),
+        timeout=settings.HEALTH_CHECK_TIMEOUT,
+    )
+    logger.debug("Pinecone health check passed")
+    return {
+        "status": "healthy",
+        "message": "Connection successful",
+        "total_vectors": stats.get("total_vector_count", 0),
+    }
+
 
-@router.get("/health")
-async def basic_health_check():
+async def _check_dependencies() -> Dict[str, Any]:
     """
-    Basic health check endpoint for quick liveness probes.
-    Returns 200 if the application is running.
+    Check MongoDB and Pinecone connectivity concurrently.
+
+    Returns:
+        Health status dict with an overall status and per-dependency checks
     """
-    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
+    timestamp = datetime.now(timezone.utc).isoformat()
+    results = await asyncio.gather(_mongo_check(), _pinecone_check(), return_exceptions=True)
+
+    checks = {}
+    for name, result in zip(("mongodb", "pinecone"), results):
+        if isinstance(result, BaseException):
+            error = (
+                f"timed out after {settings.HEALTH_CHECK_TIMEOUT}s"
+                if isinstance(result, asyncio.TimeoutError)
+                else str(result)
+            )
+            checks[name] = {"status": "unhealthy", "message": f"Connection failed: {error}"}
+            logger.error(f"{name} health check failed: {error}")
+        else:
+            checks[name] = result
+
+    overall_healthy = all(check["status"] == "healthy" for check in checks.values())
+    return {
+        "status": "healthy" if overall_healthy else "unhealthy",
+        "timestamp": timestamp,
+        "checks": checks,
+    }
+
+
+async def run_health_refresher():
+    """Refresh the readiness snapshot every HEALTH_REFRESH_INTERVAL seconds until cancelled."""
+    global _health_snapshot
+    while True:
+        health_status = await _check_dependencies()
+        _health_snapshot = (
+            status.HTTP_200_OK
+            if health_status["status"] == "healthy"
+            else status.HTTP_503_SERVICE_UNAVAILABLE,
+            orjson.dumps(health_status),
+        )
+        await asyncio.sleep(settings.HEALTH_REFRESH_INTERVAL)
 
 
 @router.get("/health/ready")
-async def readiness_check(db: AsyncIOMotorDatabase = Depends(get_database)):
+async def readiness_check():
     """
-    Readiness check endpoint that verifies all dependencies.
+    Readiness check endpoint that reports the latest dependency checks.
     Used by AWS ECS/ALB to determine if the container is ready to receive traffic.
 
     Returns:
         - 200: All dependencies are healthy
-        - 503: One or more dependencies are unhealthy
-    """
-    health_status = {
-        "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "checks": {},
-    }
-
-    overall_healthy = True
-
-    # Check MongoDB connection
-    try:
-        await db.command("ping")
-        health_status["checks"]["mongodb"] = {
-            "status": "healthy",
-            "message": "Connection successful",
-        }
-        logger.debug("MongoDB health check passed")
-    except Exception as e:
-        overall_healthy = False
-        health_status["checks"]["mongodb"] = {
-            "status": "unhealthy",
-            "message": f"Connection failed: {str(e)}",
-        }
-        logger.error(f"MongoDB health check failed: {str(e)}")
-
-    # Check Pinecone connection
-    try:
-        # Try to describe the index to verify connectivity
-        index = vector_store_service.get_index()
-        if index:
-            stats = index.describe_index_stats()
-            health_status["checks"]["pinecone"] = {
-                "status": "healthy",
-                "message": "Connection successful",
-                "total_vectors": stats.get("total_vector_count", 0),
-            }
-            logger.debug("Pinecone health check passed")
-        else:
-            overall_healthy = False
-            health_status["checks"]["pinecone"] = {
-                "status": "unhealthy",
-                "message": "Index not initialized",
-            }
-            logger.warning("Pinecone health check failed: Index not initialized")
-    except Exception as e:
-        overall_healthy = False
-        health_status["checks"]["pinecone"] = {
-            "status": "unhealthy",
-            "message": f"Connection failed: {str(e)}",
-        }
-        logger.error(f"Pinecone health check failed: {str(e)}")
-
-    # Set overall status
-    if not overall_healthy:
-        health_status["status"] = "unhealthy"
-        return health_status, status.HTTP_503_SERVICE_UNAVAILABLE
-
-    return health_status
-
-
-@router.get("/health/live")
-async def liveness_check():
-    """
-    Liveness check endpoint for container orchestration.
-    Returns 200 if the application process is alive (doesn't check dependencies).
+        - 503: One or more dependencies are unhealthy (or not checked yet)
     """
-    return {"status": "alive", "timestamp": datetime.now(timezone.utc).isoformat()}
+    status_code, body = _health_snapshot
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -30,6 +30,16 @@ class Settings(BaseSettings):
     # MongoDB Settings
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "eloquent_chatbot"
+    MONGODB_USE_TRANSACTIONS: bool = False  # Requires a replica set (e.g. Atlas)
+    MONGODB_MAX_POOL_SIZE: int = 100  # Connections per worker process
+    MONGODB_MIN_POOL_SIZE: int = 10  # Connections kept warm
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 5000  # Max wait for a free pooled connection
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 3000
+    MONGODB_CONNECT_TIMEOUT_MS: int = 2000
+    MONGODB_MAX_TIME_MS: int = 5000  # Server-side time limit for request-path queries
+    MONGODB_COMPRESSORS: str = "zstd,zlib"  # Wire compression, in order of preference
+    SESSION_CACHE_SIZE: int = 10000  # Session documents cached per worker
+    SESSION_CACHE_TTL: int = 30  # seconds
 
     # OpenAI Settings
     OPENAI_API_KEY: str
@@ -37,6 +47,8 @@ class Settings(BaseSettings):
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-ada-002"
     OPENAI_TEMPERATURE: float = 0.7
     OPENAI_MAX_TOKENS: int = 1000
+    EMBEDDING_CACHE_SIZE: int = 2048  # Query embeddings kept in memory (0 disables)
+    EMBEDDING_CACHE_PATH: str = ".cache/embeddings.sqlite3"  # Persistent ingest embedding cache ("" disables)
 
     # Pinecone Settings
     PINECONE_API_KEY: str
@@ -44,16 +56,34 @@ class Settings(BaseSettings):
     PINECONE_INDEX_NAME: str = "eloquent-faq-index"
     PINECONE_TOP_K: int = 3
     PINECONE_SIMILARITY_THRESHOLD: float = 0.75
+    PINECONE_INDEX_HOST: str = ""  # Data plane host; skips the control plane lookup at startup when set
+    PINECONE_POOL_THREADS: int = 30  # Worker threads for concurrent index requests (async_req)
+    PINECONE_MAX_RETRIES: int = 4  # Resends per failed upsert/delete batch (with backoff)
+    SEMANTIC_CACHE_SIZE: int = 2000  # Search results cached by query embedding (0 disables)
+    SEMANTIC_CACHE_THRESHOLD: float = 0.97  # Min cosine similarity to reuse cached results
+    SEMANTIC_CACHE_TTL: float = 300.0  # seconds; bounds staleness after out-of-process ingests
 
     # JWT Settings
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    TOKEN_CACHE_SIZE: int = 10000  # Verified tokens cached per worker
+    TOKEN_CACHE_TTL: int = 60  # seconds
+    # Concurrent argon2 hashes/verifies; each holds ~19 MiB, so 3 peak at ~57 MiB
+    # (fits the 512 MiB task) and one slow hash doesn't queue every other login
+    PASSWORD_HASH_WORKERS: int = 3
 
     # Session Settings
     ANONYMOUS_SESSION_COOKIE_NAME: str = "eloquent_session_id"
     ANONYMOUS_SESSION_MAX_AGE: int = 2592000  # 30 days
 
+    # Rate Limiting Settings
+    RATE_LIMIT_STORAGE_URI: str = "memory://"  # Use redis://host:6379 in production
+
+    # Health Check Settings
+    HEALTH_REFRESH_INTERVAL: float = 10.0  # seconds between readiness refreshes
+    HEALTH_CHECK_TIMEOUT: float = 2.0  # seconds per dependency check
+
     model_config = {"env_file": ".env", "case_sensitive": True, "extra": "ignore"}
 
 
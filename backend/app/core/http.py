@@ -0,0 +1,17 @@
+"""
+Shared HTTP client for outbound API calls.
+"""
+import httpx
+
+# One pooled HTTP/2 client for all OpenAI calls (chat completions and embeddings),
+# so warm TLS connections are reused and concurrent requests multiplex over them.
+# Request timeouts are applied per call by the OpenAI SDK.
+openai_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=200, max_connections=500),
+)
+
+
+async def close_http_clients():
+    """Close shared HTTP clients (called on application shutdown)."""
+    await openai_http_client.aclose()
@@ -3,7 +3,7 @@ Structured logging configuration for production CloudWatch integration.
 """
 import logging
 import sys
-import json
+import orjson
 from datetime import datetime, timezone
 from typing import Any, Dict
 from contextvars import ContextVar
@@ -12,6 +12,28 @@ from contextvars import ContextVar
 request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 
 
+def _install_request_id_factory() -> None:
+    """
+    Stamp every LogRecord with the current request ID when it is created.
+
+    The record then carries the ID with it, so formatters read a plain attribute
+    and the value stays correct even if the record is handled outside the request context.
+    """
+    base_factory = logging.getLogRecordFactory()
+    if getattr(base_factory, "_stamps_request_id", False):
+        return  # Already installed (setup_logging called again)
+
+    get_request_id = request_id_var.get
+
+    def record_factory(*args, **kwargs) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
+        record.request_id = get_request_id()
+        return record
+
+    record_factory._stamps_request_id = True
+    logging.setLogRecordFactory(record_factory)
+
+
 class JSONFormatter(logging.Formatter):
     """
     Custom JSON formatter for structured logging.
@@ -21,7 +43,8 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON string."""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # orjson renders the datetime natively (ISO 8601, "Z" suffix)
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,8 +53,8 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add request ID if available
-        request_id = request_id_var.get()
+        # Add request ID if available (stamped on the record by the record factory)
+        request_id = getattr(record, "request_id", "")
         if request_id:
             log_data["request_id"] = request_id
 
@@ -43,7 +66,8 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_data"):
             log_data["extra"] = record.extra_data
 
-        return json.dumps(log_data)
+        # default=str keeps non-JSON extras (ObjectId, exceptions, ...) from breaking logging
+        return orjson.dumps(log_data, option=orjson.OPT_UTC_Z, default=str).decode("utf-8")
 
 
 def setup_logging(level: str = "INFO", json_logs: bool = True) -> None:
@@ -56,6 +80,8 @@ def setup_logging(level: str = "INFO", json_logs: bool = True) -> None:
     """
     log_level = getattr(logging, level.upper(), logging.INFO)
 
+    _install_request_id_factory()
+
     # Create handler
     handler = logging.StreamHandler(sys.stdout)
 
@@ -0,0 +1,25 @@
+"""
+Helpers for turning vector store metadata into JSON-safe data.
+"""
+from typing import Any, Dict, Mapping
+
+# Metadata value types that are JSON-serializable as-is
+JSON_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def clean_metadata(metadata: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Make metadata JSON-safe: non-primitive values are stringified and the
+    "text" field (returned separately) is dropped.
+
+    Args:
+        metadata: Raw metadata mapping
+
+    Returns:
+        Cleaned metadata dict
+    """
+    return {
+        k: v if isinstance(v, JSON_PRIMITIVES) else str(v)
+        for k, v in metadata.items()
+        if k != "text"
+    }
@@ -1,52 +1,128 @@
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
 from app.core.config import settings
+from app.core.logging_config import get_logger
 from typing import Optional
 
+logger = get_logger(__name__)
+
+
 class MongoDB:
     """MongoDB connection manager."""
 
     client: Optional[AsyncIOMotorClient] = None
     db: Optional[AsyncIOMotorDatabase] = None
 
+    # Bump whenever the index definitions in create_indexes change
+    INDEX_SCHEMA_VERSION = 2
+
     @classmethod
     async def connect(cls):
         """Connect to MongoDB."""
-        cls.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        # One client per process; every request shares its connection pool
+        cls.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=settings.MONGODB_CONNECT_TIMEOUT_MS,
+            retryWrites=True,
+            compressors=settings.MONGODB_COMPRESSORS,
+        )
         cls.db = cls.client[settings.MONGODB_DB_NAME]
 
+        # Force the initial handshake so the first request doesn't pay for it
+        await cls.client.admin.command("ping")
+
         # Create indexes
         await cls.create_indexes()
-        print(f"Connected to MongoDB: {settings.MONGODB_DB_NAME}")
+        logger.info(
+            "Connected to MongoDB",
+            extra={"extra_data": {"db": settings.MONGODB_DB_NAME}},
+        )
 
     @classmethod
     async def close(cls):
         """Close MongoDB connection."""
         if cls.client:
             cls.client.close()
-            print("Closed MongoDB connection")
+            logger.info("Closed MongoDB connection")
 
     @classmethod
     async def create_indexes(cls):
-        """Create database indexes for optimal query performance."""
+        """
+        Create database indexes for optimal query performance.
+        Skipped when the stored index schema version is already current.
+        """
         if cls.db is None:
             return
 
-        # Sessions collection indexes
-        await cls.db.sessions.create_index("session_id", unique=True)
-        await cls.db.sessions.create_index("user_id")
-        await cls.db.sessions.create_index("created_at")
-        await cls.db.sessions.create_index("updated_at")
-
-        # Messages collection indexes (NEW)
-        await cls.db.messages.create_index("message_id", unique=True)
-        await cls.db.messages.create_index("session_id")
-        await cls.db.messages.create_index("timestamp")
-        # Compound index for efficient pagination within a session
-        await cls.db.messages.create_index([("session_id", 1), ("timestamp", -1)])
-
-        # Users collection indexes
-        await cls.db.users.create_index("email", unique=True)
-        await cls.db.users.create_index("user_id", unique=True)
+        # Subscript access: Motor doesn't expose "_"-prefixed collections as attributes
+        meta = cls.db["_meta"]
+        marker = await meta.find_one({"_id": "indexes"})
+        if marker and marker.get("version") == cls.INDEX_SCHEMA_VERSION:
+            return
+
+        # One create_indexes command per collection, all collections concurrently
+        await asyncio.gather(
+            # Sessions collection indexes
+            cls.db.sessions.create_indexes([
+                IndexModel("session_id", unique=True),
+                IndexModel("created_at"),
+                IndexModel("updated_at"),
+                # Compound index for listing a user's sessions by recency
+                IndexModel([("user_id", ASCENDING), ("updated_at", DESCENDING)]),
+            ]),
+            # Messages collection indexes
+            cls.db.messages.create_indexes([
+                IndexModel("message_id", unique=True),
+                IndexModel("timestamp"),
+                # Compound index for recent history and pagination within a session;
+                # matches the (timestamp, _id) sort so queries avoid an in-memory sort
+                IndexModel([
+                    ("session_id", ASCENDING),
+                    ("timestamp", DESCENDING),
+                    ("_id", DESCENDING),
+                ]),
+            ]),
+            # Users collection indexes
+            cls.db.users.create_indexes([
+                IndexModel("email", unique=True),
+                IndexModel("user_id", unique=True),
+            ]),
+        )
+
+        # Drop indexes made redundant by the compound indexes above (each is a
+        # prefix of one) or no longer queried; they only add write cost on every insert
+        obsolete = [
+            (cls.db.sessions, "user_id_1"),
+            (cls.db.messages, "session_id_1"),
+            (cls.db.messages, "session_id_1_timestamp_-1"),
+            (cls.db.messages, "session_id_1__id_-1"),
+        ]
+        await asyncio.gather(*[
+            cls._drop_index_if_exists(collection, index_name)
+            for collection, index_name in obsolete
+        ])
+
+        # Record the applied version so later restarts skip index setup
+        await meta.update_one(
+            {"_id": "indexes"},
+            {"$set": {"version": cls.INDEX_SCHEMA_VERSION}},
+            upsert=True,
+        )
+
+    @staticmethod
+    async def _drop_index_if_exists(collection, index_name: str):
+        """Drop an index, ignoring it if it doesn't exist."""
+        try:
+            await collection.drop_index(index_name)
+        except OperationFailure:
+            pass  # Already dropped
 
     @classmethod
     def get_db(cls) -> AsyncIOMotorDatabase:
@@ -1,16 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 # from fastapi.middleware.gzip import GZipMiddleware  # Disabled - breaks streaming
 from contextlib import asynccontextmanager
+import asyncio
+import contextlib
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 from app.core.config import settings
 from app.core.logging_config import setup_logging, get_logger
+from app.core.http import close_http_clients
 from app.db.mongodb import MongoDB
 from app.services.vector_store import vector_store_service
 from app.api import chat, auth, admin, documents, health
 from app.middleware.request_tracking import RequestTrackingMiddleware
+from app.middleware.health_interceptor import HealthCheckInterceptor
 from app.middleware.rate_limiter import limiter
 
 # Setup logging based on environment
@@ -41,14 +47,22 @@ async def lifespan(app: FastAPI):
             extra={"extra_data": {"error": str(e)}}
         )
 
+    # Keep the readiness snapshot fresh in the background
+    health_task = asyncio.create_task(health.run_health_refresher())
+
     logger.info("Application startup complete", extra={"extra_data": {"project": settings.PROJECT_NAME}})
 
     yield
 
     # Shutdown
     logger.info("Starting application shutdown")
+    # Wait for the refresher to stop so it isn't mid-ping when the client closes
+    health_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await health_task
     await MongoDB.close()
     logger.info("MongoDB connection closed")
+    await close_http_clients()
     logger.info("Application shutdown complete")
 
 
@@ -56,6 +70,7 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -68,6 +83,11 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Most modern proxies/CDNs handle compression anyway
 # app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Apply the limiter's default limits to every route (pure ASGI, so streaming
+# responses aren't buffered); inside tracking and CORS so 429s are logged and
+# carry CORS headers
+app.add_middleware(SlowAPIASGIMiddleware)
+
 # Add request tracking middleware (before CORS)
 app.add_middleware(RequestTrackingMiddleware)
 
@@ -81,6 +101,11 @@ app.add_middleware(
     expose_headers=["X-Request-ID"],  # Expose request ID header to clients
 )
 
+# Answer the root endpoint and liveness probes (/, /health, /health/live) before
+# tracking, CORS and routing
+# (added last so it wraps all other middleware)
+app.add_middleware(HealthCheckInterceptor)
+
 # Include routers
 app.include_router(health.router)  # No prefix for health checks
 app.include_router(chat.router, prefix=settings.API_V1_STR)
@@ -89,16 +114,6 @@ app.include_router(admin.router, prefix=settings.API_V1_STR)
 app.include_router(documents.router, prefix=settings.API_V1_STR)
 
 
-@app.get("/")
-async def root():
-    """Root endpoint."""
-    return {
-        "message": "Welcome to Eloquent AI Chatbot API",
-        "docs": "/docs",
-        "version": "1.0.0"
-    }
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,63 @@
+"""
+Pure ASGI interceptor that answers the root endpoint and liveness probes before
+the rest of the stack runs.
+"""
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Static probe responses, serialized once
+_PROBE_BODIES = {
+    "/": orjson.dumps({
+        "message": "Welcome to Eloquent AI Chatbot API",
+        "docs": "/docs",
+        "version": "1.0.0",
+    }),
+    "/health": orjson.dumps({"status": "healthy"}),
+    "/health/live": orjson.dumps({"status": "alive"}),
+}
+_ALLOWED_METHODS = {"GET", "HEAD"}
+
+
+class HealthCheckInterceptor:
+    """
+    Middleware that short-circuits the root endpoint and liveness probes.
+
+    - Answers GET/HEAD /, /health and /health/live with pre-serialized JSON
+    - Skips request tracking, CORS and routing for probes (ALB/ECS and uptime
+      monitors hit them constantly)
+    - Marks responses no-store so intermediaries never serve a cached probe
+    - Returns 405 for other methods on those paths
+    - Passes every other request through untouched
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        body = _PROBE_BODIES.get(scope["path"]) if scope["type"] == "http" else None
+        if body is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] not in _ALLOWED_METHODS:
+            await send({
+                "type": "http.response.start",
+                "status": 405,
+                "headers": [(b"allow", b"GET, HEAD"), (b"content-length", b"0")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": body if scope["method"] == "GET" else b"",
+        })
@@ -6,11 +6,28 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request
 
+from app.core.config import settings
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Rate limit key: the client IP as seen by the load balancer.
+    Behind the ALB the socket peer is the balancer itself, so use the last
+    X-Forwarded-For entry (the one the ALB appended; earlier ones are client-supplied).
+    """
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.rsplit(",", 1)[-1].strip()
+    return get_remote_address(request)
+
+
 # Create limiter instance with custom key function
 limiter = Limiter(
-    key_func=get_remote_address,
+    key_func=get_client_ip,
     default_limits=["100/minute"],  # Default rate limit for all endpoints
-    storage_uri="memory://",  # Use in-memory storage (for production, use Redis)
+    # Shared storage (e.g. redis://) keeps one set of counters across workers and
+    # replicas; the storage keeps a single connection pool for the process
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
 )
 
 
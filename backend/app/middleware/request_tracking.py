@@ -1,19 +1,16 @@
 """
 Request tracking middleware for distributed tracing and logging.
 """
+import os
 import time
-import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging_config import request_id_var, get_logger
 
 logger = get_logger(__name__)
 
 
-class RequestTrackingMiddleware(BaseHTTPMiddleware):
+class RequestTrackingMiddleware:
     """
     Middleware to track requests with unique IDs and log request/response metadata.
 
@@ -21,21 +18,35 @@ class RequestTrackingMiddleware(BaseHTTPMiddleware):
     - Logs request start and completion
     - Tracks request duration
     - Adds request ID to response headers for debugging
+
+    Implemented as pure ASGI (no BaseHTTPMiddleware), so there is no per-request
+    task group and streaming responses pass through unbuffered.
     """
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and add tracking metadata."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate or extract request ID
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        headers = dict(scope["headers"])
+        # (os.urandom().hex() skips building a UUID object just to format it)
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or os.urandom(16).hex()
 
         # Store request ID in context for logging
         request_id_var.set(request_id)
 
-        # Record start time
-        start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        user_agent = headers.get(b"user-agent")
+
+        # Record start time (monotonic, immune to wall-clock adjustments)
+        start_time = time.perf_counter()
 
         # Log request start
         logger.info(
@@ -43,43 +54,33 @@ class RequestTrackingMiddleware(BaseHTTPMiddleware):
             extra={
                 "extra_data": {
                     "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "client_host": request.client.host if request.client else None,
-                    "user_agent": request.headers.get("user-agent"),
+                    "method": method,
+                    "path": path,
+                    "client_host": client[0] if client else None,
+                    "user_agent": user_agent.decode("latin-1") if user_agent else None,
                 }
             },
         )
 
-        # Process request
-        try:
-            response = await call_next(request)
-
-            # Calculate duration
-            duration = time.time() - start_time
+        status_code = None
 
-            # Log request completion
-            logger.info(
-                "Request completed",
-                extra={
-                    "extra_data": {
-                        "request_id": request_id,
-                        "method": request.method,
-                        "path": request.url.path,
-                        "status_code": response.status_code,
-                        "duration_ms": round(duration * 1000, 2),
-                    }
-                },
-            )
-
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            return response
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
 
+        # Process request
+        try:
+            await self.app(scope, receive, send_with_request_id)
         except Exception as e:
             # Calculate duration
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             # Log error
             logger.error(
@@ -88,8 +89,8 @@ class RequestTrackingMiddleware(BaseHTTPMiddleware):
                 extra={
                     "extra_data": {
                         "request_id": request_id,
-                        "method": request.method,
-                        "path": request.url.path,
+                        "method": method,
+                        "path": path,
                         "duration_ms": round(duration * 1000, 2),
                         "error": str(e),
                     }
@@ -98,3 +99,20 @@ class RequestTrackingMiddleware(BaseHTTPMiddleware):
 
             # Re-raise exception to be handled by FastAPI
             raise
+
+        # Calculate duration
+        duration = time.perf_counter() - start_time
+
+        # Log request completion
+        logger.info(
+            "Request completed",
+            extra={
+                "extra_data": {
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                }
+            },
+        )
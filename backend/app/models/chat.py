@@ -19,7 +19,8 @@ class MessageRole(str, Enum):
 
 class ChatMessage(BaseModel):
     """Chat message model - stored in separate messages collection."""
-    message_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Hex form: no dash formatting and a shorter stored string than str(uuid4())
+    message_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     session_id: str
     role: MessageRole
     content: str
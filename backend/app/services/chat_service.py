@@ -1,16 +1,18 @@
 from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.http import openai_http_client
 from app.services.vector_store import vector_store_service
 from app.models.chat import Message, MessageRole
-from typing import List, Dict, Any, AsyncGenerator
-import json
+from typing import List, Dict, Any, AsyncGenerator, Optional, Tuple
 
 
 class ChatService:
     """Service for handling chat interactions with RAG."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY, http_client=openai_http_client
+        )
         self.model = settings.OPENAI_MODEL
 
         self.system_prompt = """You are a helpful AI assistant for Eloquent, a fintech company.
@@ -22,10 +24,27 @@ and suggest the user contact support.
 
 Always be professional, clear, and concise in your responses."""
 
+    async def retrieve_context(self, user_message: str) -> List[Dict[str, Any]]:
+        """
+        Retrieve relevant FAQ documents for a message from the vector store.
+        Doesn't depend on conversation history, so callers can start it early.
+
+        Args:
+            user_message: The user's message
+
+        Returns:
+            List of retrieved documents with scores and metadata
+        """
+        return await vector_store_service.search_similar(
+            query=user_message,
+            top_k=settings.PINECONE_TOP_K
+        )
+
     async def generate_response(
         self,
         user_message: str,
-        conversation_history: List[Message]
+        conversation_history: List[Message],
+        retrieved_docs: Optional[List[Dict[str, Any]]] = None
     ) -> tuple[str, List[Dict[str, Any]]]:
         """
         Generate AI response using RAG.
@@ -33,15 +52,14 @@ Always be professional, clear, and concise in your responses."""
         Args:
             user_message: The user's message
             conversation_history: Previous messages in the conversation
+            retrieved_docs: Documents from retrieve_context (retrieved here if omitted)
 
         Returns:
             Tuple of (response_text, retrieved_sources)
         """
         # Step 1: Retrieve relevant context from vector store
-        retrieved_docs = await vector_store_service.search_similar(
-            query=user_message,
-            top_k=settings.PINECONE_TOP_K
-        )
+        if retrieved_docs is None:
+            retrieved_docs = await self.retrieve_context(user_message)
 
         # Step 2: Prepare context from retrieved documents
         context = self._format_context(retrieved_docs)
@@ -68,23 +86,28 @@ Always be professional, clear, and concise in your responses."""
     async def generate_response_stream(
         self,
         user_message: str,
-        conversation_history: List[Message]
-    ) -> AsyncGenerator[str, None]:
+        conversation_history: List[Message],
+        retrieved_docs: Optional[List[Dict[str, Any]]] = None
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
         """
         Generate AI response with streaming for real-time display.
 
         Args:
             user_message: The user's message
             conversation_history: Previous messages in the conversation
+            retrieved_docs: Documents from retrieve_context (retrieved here if omitted)
 
         Yields:
-            Chunks of the response text
+            (event_type, data) tuples: ("sources", retrieved_docs) once,
+            then ("content", text_chunk) for each chunk of the response
         """
         # Retrieve context
-        retrieved_docs = await vector_store_service.search_similar(
-            query=user_message,
-            top_k=settings.PINECONE_TOP_K
-        )
+        if retrieved_docs is None:
+            retrieved_docs = await self.retrieve_context(user_message)
+
+        # Send sources first, before waiting on the model, so the client can render
+        # them while the completion request is in flight (the API encodes events into SSE frames)
+        yield "sources", retrieved_docs
 
         context = self._format_context(retrieved_docs)
 
@@ -103,30 +126,20 @@ Always be professional, clear, and concise in your responses."""
             stream=True
         )
 
-        # First, send sources as JSON (no trailing newline - API will add SSE format)
-        yield json.dumps({"type": "sources", "data": retrieved_docs})
-
-        # Then stream the response (no trailing newline - API will add SSE format)
+        # Then stream the response
         async for chunk in stream:
             if chunk.choices[0].delta.content:
-                yield json.dumps({
-                    "type": "content",
-                    "data": chunk.choices[0].delta.content
-                })
+                yield "content", chunk.choices[0].delta.content
 
     def _format_context(self, retrieved_docs: List[Dict[str, Any]]) -> str:
         """Format retrieved documents into context string."""
         if not retrieved_docs:
             return "No relevant FAQ information found."
 
-        context_parts = []
-        for i, doc in enumerate(retrieved_docs, 1):
-            category = doc["metadata"].get("category", "General")
-            context_parts.append(
-                f"[Source {i} - {category}]\n{doc['text']}\n"
-            )
-
-        return "\n".join(context_parts)
+        return "\n".join(
+            f"[Source {i} - {doc['metadata'].get('category', 'General')}]\n{doc['text']}\n"
+            for i, doc in enumerate(retrieved_docs, 1)
+        )
 
     def _build_messages(
         self,
@@ -0,0 +1,94 @@
+"""
+Persistent embedding cache backed by SQLite.
+
+Used during ingestion so re-running it over unchanged documents doesn't
+re-embed them through the OpenAI API.
+"""
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class EmbeddingCache:
+    """SQLite store of embedding vectors, keyed by a hash of (model, text)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        # Calls may come from different worker threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and create the table if needed."""
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "hash TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+        return self._conn
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key; includes the model so vectors from different models never collide."""
+        return hashlib.sha256(f"{model}|{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Dict mapping each cached text to its embedding (uncached texts are absent)
+        """
+        keys = {self.key(model, text): text for text in texts}
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            conn = self._connect()
+            hashes = list(keys)
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE hash IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for hash_, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[keys[hash_]] = vector.tolist()
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        """
+        Store embeddings (float32 BLOBs).
+
+        Args:
+            model: Embedding model name
+            embeddings: Dict mapping text to its embedding
+        """
+        rows = [
+            (self.key(model, text), model, len(vector), array("f", vector).tobytes())
+            for text, vector in embeddings.items()
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (hash, model, dim, vector) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
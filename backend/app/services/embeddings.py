@@ -1,20 +1,46 @@
 from openai import AsyncOpenAI
 from app.core.config import settings
-from typing import List
+from app.core.http import openai_http_client
+from collections import OrderedDict
+from typing import List, Tuple
+import numpy as np
 import tiktoken
 
 
+def normalize_embeddings(embeddings: List[List[float]]) -> List[List[float]]:
+    """
+    L2-normalize embedding vectors, so their dot product is their cosine similarity.
+
+    Args:
+        embeddings: Embedding vectors
+
+    Returns:
+        Unit-length vectors, in the same order
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+    return vectors.tolist()
+
+
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY, http_client=openai_http_client
+        )
         self.model = settings.OPENAI_EMBEDDING_MODEL
         self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
 
+        # LRU cache of single-text embeddings (stored as tuples so they can't be mutated)
+        self._cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._cache_size = settings.EMBEDDING_CACHE_SIZE
+
     async def generate_embedding(self, text: str) -> List[float]:
         """
-        Generate embedding for a single text.
+        Generate embedding for a single text (unit length).
+        Results are cached in memory, so repeated texts skip the API call; the cache
+        key ignores case and extra whitespace, so near-identical queries share an entry.
 
         Args:
             text: Text to embed
@@ -22,11 +48,24 @@ class EmbeddingService:
         Returns:
             List of floats representing the embedding vector
         """
+        key = " ".join(text.lower().split())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return list(cached)
+
         response = await self.client.embeddings.create(
             input=text,
             model=self.model
         )
-        return response.data[0].embedding
+        embedding = normalize_embeddings([response.data[0].embedding])[0]
+
+        if self._cache_size > 0:
+            self._cache[key] = tuple(embedding)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return embedding
 
     async def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """
@@ -36,13 +75,13 @@ class EmbeddingService:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors (unit length)
         """
         response = await self.client.embeddings.create(
             input=texts,
             model=self.model
         )
-        return [item.embedding for item in response.data]
+        return normalize_embeddings([item.embedding for item in response.data])
 
     def count_tokens(self, text: str) -> int:
         """Count the number of tokens in a text."""
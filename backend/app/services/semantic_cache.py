@@ -0,0 +1,98 @@
+"""
+Near-match cache of vector search results, keyed by query embedding.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# int8 quantization: unit-vector components in [-1, 1] map to [-127, 127]
+_QUANT_SCALE = 127
+# Converts an int8 dot product back to cosine similarity
+_SIM_SCALE = 1.0 / (_QUANT_SCALE * _QUANT_SCALE)
+
+
+class SemanticCache:
+    """
+    Caches search results and reuses them for any later query whose embedding is
+    close enough (cosine similarity >= threshold) to a cached query's embedding.
+
+    Embeddings are stored normalized and quantized to int8 in one preallocated
+    matrix (a quarter of the float32 size), so a lookup is a single int8
+    matrix-vector product accumulated in int32. Quantization error on the
+    similarity is far below the reuse threshold's margin. Entries are overwritten
+    oldest-first once the cache is full, and expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, threshold: float, ttl: float):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self._matrix: Optional[np.ndarray] = None  # (maxsize, dim) int8, allocated on first put
+        self._expires = np.zeros(maxsize, dtype=np.float64)
+        self._top_ks = np.zeros(maxsize, dtype=np.int64)
+        self._entries: List[Optional[list]] = [None] * maxsize  # results
+        self._count = 0  # Filled rows
+        self._next = 0  # Next row to (over)write
+
+    @staticmethod
+    def _quantize(embedding: List[float]) -> np.ndarray:
+        """Normalize an embedding and quantize it to int8."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        quantized = np.clip(np.round(vector * _QUANT_SCALE), -_QUANT_SCALE, _QUANT_SCALE)
+        return quantized.astype(np.int8)
+
+    def get(self, embedding: List[float], top_k: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find cached results for a query embedding.
+
+        Args:
+            embedding: Query embedding
+            top_k: Number of results requested (only entries with the same top_k match)
+
+        Returns:
+            Cached results of the most similar query, or None if nothing is close enough
+        """
+        if self._count == 0:
+            return None
+
+        # int32 accumulation: an int8 matmul would overflow
+        sims = np.einsum(
+            "ij,j->i", self._matrix[:self._count], self._quantize(embedding), dtype=np.int32
+        ) * _SIM_SCALE
+        # Expired rows and rows cached for a different top_k never match
+        sims[self._expires[:self._count] < time.monotonic()] = -1.0
+        sims[self._top_ks[:self._count] != top_k] = -1.0
+        best = int(sims.argmax())
+        if sims[best] < self.threshold:
+            return None
+        return list(self._entries[best])
+
+    def put(self, embedding: List[float], top_k: int, results: List[Dict[str, Any]]):
+        """
+        Cache the results of a query.
+
+        Args:
+            embedding: Query embedding
+            top_k: Number of results requested
+            results: Search results for the query
+        """
+        if self._matrix is None:
+            self._matrix = np.zeros((self.maxsize, len(embedding)), dtype=np.int8)
+
+        row = self._next
+        self._matrix[row] = self._quantize(embedding)
+        self._expires[row] = time.monotonic() + self.ttl
+        self._top_ks[row] = top_k
+        self._entries[row] = list(results)
+        self._next = (row + 1) % self.maxsize
+        self._count = min(self._count + 1, self.maxsize)
+
+    def clear(self):
+        """Drop all entries (e.g. after the index was written to)."""
+        self._entries = [None] * self.maxsize
+        self._count = 0
+        self._next = 0
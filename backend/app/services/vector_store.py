@@ -1,7 +1,66 @@
-from pinecone import Pinecone, ServerlessSpec
+import asyncio
+import itertools
+import threading
+
+import orjson
+from pinecone import NotFoundException, Pinecone, PineconeApiException, ServerlessSpec
+from pinecone.config.openapi import OpenApiConfigFactory
+from pinecone.utils import normalize_host
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from app.core.config import settings
+from app.core.logging_config import get_logger
 from app.services.embeddings import embedding_service
-from typing import List, Dict, Any, Optional
+from app.services.embedding_cache import EmbeddingCache
+from app.services.semantic_cache import SemanticCache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = get_logger(__name__)
+
+# Documents embedded per embeddings API request (one pipeline chunk)
+EMBED_BATCH_SIZE = 200
+# Upsert request limits: at most this many vectors, and an estimated payload
+# under this many bytes (Pinecone rejects requests over 2MB)
+UPSERT_BATCH_SIZE = 200
+UPSERT_MAX_BATCH_BYTES = 1_800_000
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Yield consecutive lists of up to `size` items from any iterable.
+
+    Args:
+        items: Items to split
+        size: Maximum batch size
+
+    Yields:
+        Batches of items, in order
+    """
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a Pinecone error is worth retrying (rate limited or server-side)."""
+    return isinstance(exc, PineconeApiException) and (
+        exc.status == 429 or (exc.status or 0) >= 500
+    )
+
+
+@retry(
+    stop=stop_after_attempt(settings.PINECONE_MAX_RETRIES),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+def _resend_batch(send: Callable[[Any], Any], batch: Any):
+    """Resend a failed batch and wait for it, retrying transient API errors (429/5xx) with backoff."""
+    send(batch).get()
 
 
 class VectorStoreService:
@@ -10,7 +69,28 @@ class VectorStoreService:
     def __init__(self):
         self.pc = None
         self.index_name = settings.PINECONE_INDEX_NAME
-        self.index = None
+        self._index = None
+        # Bumped on every write so read-side caches can tell when data changed
+        self.write_version = 0
+        # Persistent cache of document embeddings, so re-ingesting skips unchanged texts
+        self.embedding_cache = (
+            EmbeddingCache(settings.EMBEDDING_CACHE_PATH)
+            if settings.EMBEDDING_CACHE_PATH
+            else None
+        )
+        # Search results reused for near-identical queries (default namespace, no filter)
+        self.semantic_cache = (
+            SemanticCache(
+                maxsize=settings.SEMANTIC_CACHE_SIZE,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                ttl=settings.SEMANTIC_CACHE_TTL,
+            )
+            if settings.SEMANTIC_CACHE_SIZE > 0
+            else None
+        )
+        self._semantic_cache_version = 0
+        # Serializes index setup so concurrent callers connect only once
+        self._init_lock = threading.Lock()
 
     def _ensure_initialized(self):
         """Lazy initialization of Pinecone client."""
@@ -18,24 +98,58 @@ class VectorStoreService:
             self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
 
     def initialize_index(self):
-        """Initialize or connect to Pinecone index."""
+        """Initialize or connect to Pinecone index (no-op once connected)."""
+        with self._init_lock:
+            if self._index is None:
+                self._connect_index()
+
+    @property
+    def index(self):
+        """Pinecone index client, connected on first use."""
+        if self._index is None:
+            self.initialize_index()
+        return self._index
+
+    def _connect_index(self):
+        """Resolve the index host (creating the index if needed) and open the data plane client."""
         self._ensure_initialized()
-        # Check if index exists
-        existing_indexes = [index.name for index in self.pc.list_indexes()]
-
-        if self.index_name not in existing_indexes:
-            # Create index if it doesn't exist
-            self.pc.create_index(
-                name=self.index_name,
-                dimension=1536,  # OpenAI ada-002 embedding dimension
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud="aws",
-                    region=settings.PINECONE_ENVIRONMENT
+
+        host = settings.PINECONE_INDEX_HOST
+        if not host:
+            # A single describe call both checks that the index exists and returns
+            # its host (instead of listing every index in the project first)
+            try:
+                host = self.pc.describe_index(self.index_name).host
+            except NotFoundException:
+                # Create index if it doesn't exist
+                self.pc.create_index(
+                    name=self.index_name,
+                    dimension=1536,  # OpenAI ada-002 embedding dimension
+                    # Embeddings are L2-normalized, so dot product equals cosine
+                    # similarity and skips the per-query norm computation
+                    metric="dotproduct",
+                    spec=ServerlessSpec(
+                        cloud="aws",
+                        region=settings.PINECONE_ENVIRONMENT
+                    )
                 )
-            )
+                host = self.pc.describe_index(self.index_name).host
+        host = normalize_host(host)
+
+        # Keep one keep-alive connection per worker thread: the default urllib3 pool
+        # is smaller than pool_threads, so concurrent requests would otherwise open
+        # (and drop) extra TLS connections
+        openapi_config = OpenApiConfigFactory.build(
+            api_key=settings.PINECONE_API_KEY, host=host
+        )
+        openapi_config.connection_pool_maxsize = settings.PINECONE_POOL_THREADS
 
-        self.index = self.pc.Index(self.index_name)
+        # pool_threads backs async_req calls, so batches can be in flight concurrently
+        self._index = self.pc.Index(
+            host=host,
+            pool_threads=settings.PINECONE_POOL_THREADS,
+            openapi_config=openapi_config,
+        )
         print(f"Connected to Pinecone index: {self.index_name}")
 
     async def upsert_documents(
@@ -50,32 +164,151 @@ class VectorStoreService:
             documents: List of dicts with 'id', 'text', and 'metadata'
             namespace: Optional namespace for organizing vectors
         """
-        if not self.index:
-            self.initialize_index()
+        # Two-stage pipeline: the next chunk is embedded while the previous one
+        # is being upserted. The bounded queue keeps embedding at most a couple
+        # of chunks ahead of Pinecone.
+        ready: "asyncio.Queue[Optional[List[Dict[str, Any]]]]" = asyncio.Queue(maxsize=2)
+
+        async def embed_worker():
+            for chunk in chunked(documents, EMBED_BATCH_SIZE):
+                embeddings = await self._embed_texts([doc["text"] for doc in chunk])
+                await ready.put([
+                    {
+                        "id": doc["id"],
+                        "values": values,
+                        # Copy of the metadata with the text added, built in one call
+                        "metadata": dict(doc.get("metadata") or (), text=doc["text"])
+                    }
+                    for doc, values in zip(chunk, embeddings)
+                ])
+            await ready.put(None)  # No more chunks
+
+        async def upsert_worker():
+            while (vectors := await ready.get()) is not None:
+                # Batches are dispatched concurrently; joining them blocks, so it
+                # runs in a worker thread
+                batches = self._pack_batches(vectors)
+                await asyncio.to_thread(self._upsert_batches, batches, namespace)
+
+        # A failure in either stage cancels the other; re-raise the original error
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(embed_worker())
+                tg.create_task(upsert_worker())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        finally:
+            # Part of the data may have been written even if a stage failed
+            self.write_version += 1
+
+        print(f"Upserted {len(documents)} documents to Pinecone")
+
+    async def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, reusing vectors from the persistent embedding cache.
+        Only unique texts missing from the cache are sent to the embeddings API.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors, in the same order as texts
+        """
+        # Many articles share the same answer text; embed each distinct text once
+        unique_texts = list(dict.fromkeys(texts))
+
+        if self.embedding_cache is None:
+            embeddings = dict(zip(
+                unique_texts, await embedding_service.generate_embeddings_batch(unique_texts)
+            ))
+            return [embeddings[text] for text in texts]
+
+        model = embedding_service.model
+        embeddings = await asyncio.to_thread(self.embedding_cache.get_many, model, unique_texts)
+
+        uncached = [text for text in unique_texts if text not in embeddings]
+        if uncached:
+            new_embeddings = dict(zip(
+                uncached, await embedding_service.generate_embeddings_batch(uncached)
+            ))
+            await asyncio.to_thread(self.embedding_cache.put_many, model, new_embeddings)
+            embeddings.update(new_embeddings)
+
+        logger.info(
+            "Embedding cache lookup",
+            extra={"extra_data": {
+                "hits": len(unique_texts) - len(uncached),
+                "misses": len(uncached),
+                "duplicates_skipped": len(texts) - len(unique_texts),
+            }},
+        )
+        return [embeddings[text] for text in texts]
+
+    @staticmethod
+    def _pack_batches(vectors: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Split vectors into upsert batches by estimated payload size, so long
+        metadata (article text) can't push a request over Pinecone's size limit.
+
+        Args:
+            vectors: Vectors to upsert
+
+        Returns:
+            Batches of at most UPSERT_BATCH_SIZE vectors and ~UPSERT_MAX_BATCH_BYTES each
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+        for vector in vectors:
+            # id + float32 values + serialized metadata
+            size = (
+                len(vector["id"])
+                + 4 * len(vector["values"])
+                + len(orjson.dumps(vector["metadata"], default=str))
+            )
+            if batch and (
+                len(batch) == UPSERT_BATCH_SIZE or batch_bytes + size > UPSERT_MAX_BATCH_BYTES
+            ):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(vector)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _upsert_batches(self, batches: List[List[Dict[str, Any]]], namespace: str):
+        """
+        Upsert batches concurrently and wait for all of them.
+
+        Args:
+            batches: Lists of vectors, each sent as one upsert request
+            namespace: Namespace to upsert into
+        """
+        self._run_batches(
+            lambda batch: self.index.upsert(vectors=batch, namespace=namespace, async_req=True),
+            batches,
+        )
+
+    @staticmethod
+    def _run_batches(send: Callable[[Any], Any], batches: List[Any]):
+        """
+        Send every batch with async_req on the index thread pool, then wait for all of them.
+        A batch that fails with a transient Pinecone API error is resent (see
+        _resend_batch); any other error (bad request, auth) is raised right away.
 
-        # Generate embeddings for all documents
-        texts = [doc["text"] for doc in documents]
-        embeddings = await embedding_service.generate_embeddings_batch(texts)
-
-        # Prepare vectors for upsert
-        vectors = []
-        for i, doc in enumerate(documents):
-            vectors.append({
-                "id": doc["id"],
-                "values": embeddings[i],
-                "metadata": {
-                    **doc.get("metadata", {}),
-                    "text": doc["text"]
-                }
-            })
-
-        # Upsert in batches of 100
-        batch_size = 100
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            self.index.upsert(vectors=batch, namespace=namespace)
-
-        print(f"Upserted {len(vectors)} documents to Pinecone")
+        Args:
+            send: Issues one async_req request for a batch and returns its AsyncResult
+            batches: Batches to send
+        """
+        pending = [(batch, send(batch)) for batch in batches]
+        for batch, result in pending:
+            try:
+                result.get()
+            except PineconeApiException as exc:
+                if not _is_transient(exc):
+                    raise
+                _resend_batch(send, batch)
 
     async def search_similar(
         self,
@@ -96,17 +329,27 @@ class VectorStoreService:
         Returns:
             List of matched documents with scores and metadata
         """
-        if not self.index:
-            self.initialize_index()
-
         if top_k is None:
             top_k = settings.PINECONE_TOP_K
 
         # Generate query embedding
         query_embedding = await embedding_service.generate_embedding(query)
 
-        # Search in Pinecone
-        results = self.index.query(
+        # Near-duplicate queries reuse earlier results (filtered/namespaced searches aren't cached)
+        semantic_cache = (
+            self.semantic_cache if not namespace and filter_dict is None else None
+        )
+        if semantic_cache is not None:
+            if self._semantic_cache_version != self.write_version:
+                semantic_cache.clear()
+                self._semantic_cache_version = self.write_version
+            cached = semantic_cache.get(query_embedding, top_k)
+            if cached is not None:
+                return cached
+
+        # Search in Pinecone (the SDK call blocks, so run it in a worker thread)
+        results = await asyncio.to_thread(
+            self._query,
             vector=query_embedding,
             top_k=top_k,
             include_metadata=True,
@@ -114,17 +357,81 @@ class VectorStoreService:
             filter=filter_dict
         )
 
-        # Filter by similarity threshold and format results
+        matched_docs = self._format_matches(results.matches)
+        if semantic_cache is not None:
+            semantic_cache.put(query_embedding, top_k, matched_docs)
+        return matched_docs
+
+    async def search_similar_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None,
+        namespace: str = "",
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar documents for several queries at once.
+
+        All queries are embedded with a single batch request, then the
+        Pinecone queries are dispatched in parallel.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of results to return per query
+            namespace: Optional namespace to search in
+            filter_dict: Optional metadata filter
+
+        Returns:
+            One list of matched documents per query, in the same order
+        """
+        if not queries:
+            return []
+
+        if top_k is None:
+            top_k = settings.PINECONE_TOP_K
+
+        # Generate all query embeddings in one request
+        query_embeddings = await embedding_service.generate_embeddings_batch(queries)
+
+        # The Pinecone client is synchronous, so fan the queries out to threads
+        results = await asyncio.gather(*[
+            asyncio.to_thread(
+                self._query,
+                vector=query_embedding,
+                top_k=top_k,
+                include_metadata=True,
+                namespace=namespace,
+                filter=filter_dict
+            )
+            for query_embedding in query_embeddings
+        ])
+
+        return [self._format_matches(result.matches) for result in results]
+
+    def _query(self, **kwargs):
+        """
+        Query the index. Runs in a worker thread: the index is resolved there too,
+        so a lazy connect (describe/create index) never blocks the event loop.
+        """
+        return self.index.query(**kwargs)
+
+    def _format_matches(self, matches) -> List[Dict[str, Any]]:
+        """Filter matches by similarity threshold and format them as dicts."""
+        # Loop invariants bound locally; attribute reads on the SDK's OpenAPI models go
+        # through a dynamic lookup, so each field is read only once per match
+        threshold = settings.PINECONE_SIMILARITY_THRESHOLD
         matched_docs = []
-        for match in results.matches:
-            if match.score >= settings.PINECONE_SIMILARITY_THRESHOLD:
-                matched_docs.append({
+        append = matched_docs.append
+        for match in matches:
+            score = match.score
+            if score >= threshold:
+                # Shallow copy, then split the text off (cheaper than filtering every key)
+                metadata = dict(match.metadata)
+                append({
                     "id": match.id,
-                    "score": match.score,
-                    "text": match.metadata.get("text", ""),
-                    "metadata": {
-                        k: v for k, v in match.metadata.items() if k != "text"
-                    }
+                    "score": score,
+                    "text": metadata.pop("text", ""),
+                    "metadata": metadata
                 })
 
         return matched_docs
@@ -137,35 +444,30 @@ class VectorStoreService:
             ids: List of vector IDs to delete
             namespace: Optional namespace
         """
-        if not self.index:
-            self.initialize_index()
-
         if not ids:
             return
 
-        # Delete in batches of 1000 (Pinecone limit)
-        batch_size = 1000
-        for i in range(0, len(ids), batch_size):
-            batch = ids[i:i + batch_size]
-            self.index.delete(ids=batch, namespace=namespace)
+        # Delete in batches of 1000 (Pinecone limit), all dispatched concurrently
+        self._run_batches(
+            lambda batch: self.index.delete(ids=batch, namespace=namespace, async_req=True),
+            list(chunked(ids, 1000)),
+        )
+        self.write_version += 1
 
         print(f"Deleted {len(ids)} vectors from Pinecone")
 
     def delete_namespace(self, namespace: str):
         """Delete all vectors in a namespace."""
-        if not self.index:
-            self.initialize_index()
         self.index.delete(delete_all=True, namespace=namespace)
+        self.write_version += 1
 
     def get_index_stats(self) -> Dict[str, Any]:
         """Get statistics about the index."""
-        if not self.index:
-            self.initialize_index()
         return self.index.describe_index_stats()
 
     def get_index(self):
-        """Get the Pinecone index instance."""
-        return self.index
+        """Get the Pinecone index instance (None if not connected yet)."""
+        return self._index
 
 
 # Singleton instance
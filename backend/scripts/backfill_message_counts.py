@@ -0,0 +1,108 @@
+"""
+Script to backfill the `message_count` field on chat sessions.
+
+Sessions now keep a running `message_count` that is incremented whenever a
+chat turn is saved. This script computes the counter from the messages
+collection for sessions created before the counter existed. Sessions that
+already have a counter are left alone, and each write is guarded so it can't
+overwrite a counter the app stored (and incremented) meanwhile.
+
+Usage:
+    python scripts/backfill_message_counts.py [--live]
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.core.config import settings
+
+
+async def backfill_message_counts(dry_run: bool = True):
+    """
+    Main backfill function.
+
+    Args:
+        dry_run: If True, only show what would be updated without writing
+    """
+    print("=" * 70)
+    print("Session Message Count Backfill Script")
+    print("=" * 70)
+    print()
+
+    if dry_run:
+        print("🔍 DRY RUN MODE - No sessions will be updated")
+        print()
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+
+    try:
+        # Count messages per session in a single aggregation
+        pipeline = [{"$group": {"_id": "$session_id", "count": {"$sum": 1}}}]
+        counts = {
+            stat["_id"]: stat["count"]
+            async for stat in db.messages.aggregate(pipeline)
+        }
+
+        # Sessions without a counter yet
+        updates = []
+        async for session in db.sessions.find(
+            {"message_count": {"$exists": False}},
+            projection={"session_id": 1, "_id": 0},
+        ):
+            updates.append(
+                UpdateOne(
+                    {
+                        "session_id": session["session_id"],
+                        "message_count": {"$exists": False},
+                    },
+                    {"$set": {"message_count": counts.get(session["session_id"], 0)}},
+                )
+            )
+
+        print("📊 Analysis Results:")
+        print(f"   Sessions with messages: {len(counts)}")
+        print(f"   Sessions needing an update: {len(updates)}")
+        print()
+
+        if not updates:
+            print("✅ All session message counts are up to date!")
+        elif dry_run:
+            print(f"✅ DRY RUN COMPLETE - Would update {len(updates)} sessions")
+            print()
+            print("To actually update these sessions, run:")
+            print("   python scripts/backfill_message_counts.py --live")
+        else:
+            result = await db.sessions.bulk_write(updates, ordered=False)
+            print(f"✅ Successfully updated {result.modified_count} sessions!")
+    finally:
+        client.close()
+
+    print()
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Backfill message_count on chat sessions"
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Actually update the sessions (default is dry-run mode)",
+    )
+
+    args = parser.parse_args()
+
+    # Run backfill
+    asyncio.run(backfill_message_counts(dry_run=not args.live))
@@ -2,9 +2,10 @@
 Script to clean up Pinecone vectors with empty or minimal metadata.
 
 This script will:
-1. Query the vector database for all documents
-2. Identify documents with empty metadata (no question, answer, or category)
-3. Delete those documents from Pinecone
+1. Find documents with empty metadata (no question, answer, or category) by
+   listing and fetching every vector (or, on SDKs without list(), with a
+   server-side metadata filter query)
+2. Delete exactly those documents from Pinecone, by ID
 
 Usage:
     python scripts/cleanup_empty_metadata.py [--dry-run]
@@ -22,32 +23,94 @@ from app.services.vector_store import vector_store_service
 from app.services.embeddings import embedding_service
 
 
-async def query_all_documents(sample_query: str = "", top_k: int = 10000):
+# Server-side filter for vectors lacking all of question, answer and category
+# (each field either missing or empty)
+EMPTY_METADATA_FILTER = {
+    "$and": [
+        {"$or": [{field: {"$exists": False}}, {field: {"$eq": ""}}]}
+        for field in ("question", "answer", "category")
+    ]
+}
+
+# Maximum number of IDs per Pinecone fetch request
+FETCH_BATCH_SIZE = 1000
+
+
+def has_empty_metadata(metadata: dict) -> bool:
+    """Client-side equivalent of EMPTY_METADATA_FILTER."""
+    return not (
+        metadata.get("question") or metadata.get("answer") or metadata.get("category")
+    )
+
+
+def list_empty_metadata_documents():
+    """
+    Scan the whole namespace with list() + fetch() and keep documents with empty metadata.
+    Needs no query embedding and, unlike a top_k query, sees every vector.
+    """
+    print("Listing all vectors in Pinecone...")
+
+    # Initialize the index
+    vector_store_service.initialize_index()
+    index = vector_store_service.index
+
+    documents = []
+    scanned = 0
+
+    def fetch_batch(ids):
+        fetched = index.fetch(ids=ids, namespace="")
+        for vector_id, vector in fetched.vectors.items():
+            metadata = dict(vector.metadata or {})
+            text = metadata.pop("text", "")
+            if has_empty_metadata(metadata):
+                documents.append({"id": vector_id, "text": text, "metadata": metadata})
+
+    # list() yields pages of IDs; fetch them in batches of the Pinecone maximum
+    pending = []
+    for id_page in index.list(namespace=""):
+        pending.extend(id_page)
+        scanned += len(id_page)
+        if len(pending) >= FETCH_BATCH_SIZE:
+            fetch_batch(pending[:FETCH_BATCH_SIZE])
+            pending = pending[FETCH_BATCH_SIZE:]
+    if pending:
+        fetch_batch(pending)
+
+    print(f"Scanned {scanned} vectors, {len(documents)} with empty metadata")
+    return documents
+
+
+async def query_empty_metadata_documents(top_k: int = 10000):
     """
-    Query Pinecone to get a large sample of documents.
-    Note: Pinecone doesn't provide a "fetch all" method, so we use a generic query.
+    Query Pinecone for documents matching EMPTY_METADATA_FILTER.
+    The filter is applied server-side, so only matching vectors are returned.
+    Fallback for SDK versions without index.list(); sees at most top_k vectors.
     """
-    print(f"Querying Pinecone with sample query to fetch documents...")
+    print(f"Querying Pinecone for documents with empty metadata...")
 
     # Initialize the index
     vector_store_service.initialize_index()
 
-    # Generate embedding for the query
-    query_embedding = await embedding_service.generate_embedding(sample_query)
+    # Any vector works as the query since only the filter matters here
+    query_embedding = await embedding_service.generate_embedding("")
 
-    # Query without similarity threshold to get many results
     results = vector_store_service.index.query(
-        vector=query_embedding, top_k=top_k, include_metadata=True, namespace=""
+        vector=query_embedding,
+        top_k=top_k,
+        include_metadata=True,
+        namespace="",
+        filter=EMPTY_METADATA_FILTER,
     )
 
     documents = []
     for match in results.matches:
+        metadata = dict(match.metadata)
         documents.append(
             {
                 "id": match.id,
                 "score": match.score,
-                "text": match.metadata.get("text", ""),
-                "metadata": {k: v for k, v in match.metadata.items() if k != "text"},
+                "text": metadata.pop("text", ""),
+                "metadata": metadata,
             }
         )
 
@@ -55,29 +118,6 @@ async def query_all_documents(sample_query: str = "", top_k: int = 10000):
     return documents
 
 
-def has_empty_metadata(doc):
-    """
-    Check if a document has empty or minimal metadata.
-    A document is considered to have empty metadata if it lacks all of:
-    - question
-    - answer
-    - category
-    """
-    metadata = doc.get("metadata", {})
-
-    # If metadata is completely empty
-    if not metadata:
-        return True
-
-    # Check if it has none of the important fields
-    has_question = "question" in metadata and metadata["question"]
-    has_answer = "answer" in metadata and metadata["answer"]
-    has_category = "category" in metadata and metadata["category"]
-
-    # If it has none of these important fields, consider it empty
-    return not (has_question or has_answer or has_category)
-
-
 async def cleanup_empty_metadata(dry_run: bool = True):
     """
     Main cleanup function.
@@ -102,22 +142,16 @@ async def cleanup_empty_metadata(dry_run: bool = True):
             return
         print()
 
-    # Query for documents
-    documents = await query_all_documents(top_k=10000)
-
-    if not documents:
-        print("No documents found in the database.")
-        return
-
-    # Filter documents with empty metadata
-    empty_metadata_docs = [doc for doc in documents if has_empty_metadata(doc)]
+    # Find documents with empty metadata
+    vector_store_service.initialize_index()
+    if hasattr(vector_store_service.index, "list"):
+        empty_metadata_docs = list_empty_metadata_documents()
+    else:
+        # This Pinecone SDK has no list(); use a filtered query instead
+        empty_metadata_docs = await query_empty_metadata_documents(top_k=10000)
 
     print(f"📊 Analysis Results:")
-    print(f"   Total documents queried: {len(documents)}")
     print(f"   Documents with empty metadata: {len(empty_metadata_docs)}")
-    print(
-        f"   Documents with valid metadata: {len(documents) - len(empty_metadata_docs)}"
-    )
     print()
 
     if not empty_metadata_docs:
@@ -139,18 +173,17 @@ async def cleanup_empty_metadata(dry_run: bool = True):
         print(f"   ... and {len(empty_metadata_docs) - 10} more")
         print()
 
-    # Extract IDs to delete
-    ids_to_delete = [doc["id"] for doc in empty_metadata_docs]
-
     if dry_run:
-        print(f"✅ DRY RUN COMPLETE - Would delete {len(ids_to_delete)} documents")
+        print(f"✅ DRY RUN COMPLETE - Would delete {len(empty_metadata_docs)} documents")
         print()
         print("To actually delete these documents, run:")
         print("   python scripts/cleanup_empty_metadata.py --live")
     else:
-        print(f"🗑️  Deleting {len(ids_to_delete)} documents...")
-        vector_store_service.delete_by_ids(ids_to_delete)
-        print(f"✅ Successfully deleted {len(ids_to_delete)} documents!")
+        # Delete the listed IDs rather than by filter, so exactly the documents
+        # counted and sampled above are removed
+        print(f"🗑️  Deleting {len(empty_metadata_docs)} documents...")
+        vector_store_service.delete_by_ids([doc["id"] for doc in empty_metadata_docs])
+        print(f"✅ Successfully deleted {len(empty_metadata_docs)} documents!")
 
         # Show updated stats
         stats = vector_store_service.get_index_stats()
@@ -10,10 +10,11 @@ Usage:
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
+import orjson
+
 # Add backend to path
 backend_path = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_path))
@@ -29,27 +30,13 @@ def has_empty_metadata(doc):
     - answer
     - category
     """
-    metadata = doc.get("metadata", {})
-
-    # If metadata is completely empty
-    if not metadata:
-        return True
-
-    # Check if it has none of the important fields
-    has_question = "question" in metadata and metadata["question"]
-    has_answer = "answer" in metadata and metadata["answer"]
-    has_category = "category" in metadata and metadata["category"]
-
-    # Also check for documents that only have "source" field (scraped web content)
-    only_has_source = (
-        "source" in metadata and
-        not has_question and
-        not has_answer and
-        not has_category
-    )
+    metadata = doc.get("metadata") or {}
 
-    # If it has none of the important fields, or only has source, consider it for deletion
-    return not (has_question or has_answer or has_category)
+    # Short-circuits on the first non-empty field; documents that only have a
+    # "source" field (scraped web content) are caught here too
+    return not (
+        metadata.get("question") or metadata.get("answer") or metadata.get("category")
+    )
 
 
 def cleanup_from_json(json_file_path: str, dry_run: bool = True):
@@ -67,12 +54,11 @@ def cleanup_from_json(json_file_path: str, dry_run: bool = True):
 
     # Read JSON file
     try:
-        with open(json_file_path, 'r') as f:
-            data = json.load(f)
+        data = orjson.loads(Path(json_file_path).read_bytes())
     except FileNotFoundError:
         print(f"❌ Error: File '{json_file_path}' not found")
         return
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"❌ Error: Invalid JSON in file '{json_file_path}'")
         return
 
@@ -97,9 +83,10 @@ def cleanup_from_json(json_file_path: str, dry_run: bool = True):
             return
         print()
 
-    # Filter documents with empty metadata
-    empty_metadata_docs = [doc for doc in documents if has_empty_metadata(doc)]
-    valid_metadata_docs = [doc for doc in documents if not has_empty_metadata(doc)]
+    # Split documents by metadata in a single pass
+    empty_metadata_docs, valid_metadata_docs = [], []
+    for doc in documents:
+        (empty_metadata_docs if has_empty_metadata(doc) else valid_metadata_docs).append(doc)
 
     print(f"📊 Analysis Results:")
     print(f"   Total documents: {len(documents)}")
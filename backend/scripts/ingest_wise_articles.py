@@ -9,10 +9,11 @@ Usage:
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
+import orjson
+
 # Add backend to path
 backend_path = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_path))
@@ -20,6 +21,11 @@ sys.path.insert(0, str(backend_path))
 from app.services.vector_store import vector_store_service
 
 
+def load_documents(json_file: Path) -> list:
+    """Read a Wise help articles file and return its documents."""
+    return orjson.loads(json_file.read_bytes()).get("documents", [])
+
+
 async def ingest_wise_articles(dry_run: bool = False):
     """
     Main ingestion function.
@@ -56,22 +62,23 @@ async def ingest_wise_articles(dry_run: bool = False):
         print(f"   - {f.name}")
     print()
 
-    # Load all documents from JSON files
+    # Load all documents from JSON files (read and parsed concurrently)
     all_documents = []
 
-    for json_file in existing_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                documents = data.get("documents", [])
-                all_documents.extend(documents)
-                print(f"✅ Loaded {len(documents)} documents from {json_file.name}")
-        except json.JSONDecodeError as e:
-            print(f"❌ Error reading {json_file.name}: {e}")
+    loaded = await asyncio.gather(
+        *(asyncio.to_thread(load_documents, json_file) for json_file in existing_files),
+        return_exceptions=True,
+    )
+
+    for json_file, documents in zip(existing_files, loaded):
+        if isinstance(documents, orjson.JSONDecodeError):
+            print(f"❌ Error reading {json_file.name}: {documents}")
             return
-        except Exception as e:
-            print(f"❌ Error loading {json_file.name}: {e}")
+        if isinstance(documents, Exception):
+            print(f"❌ Error loading {json_file.name}: {documents}")
             return
+        all_documents.extend(documents)
+        print(f"✅ Loaded {len(documents)} documents from {json_file.name}")
 
     print()
     print(f"📊 Total documents loaded: {len(all_documents)}")
@@ -0,0 +1,90 @@
+import math
+
+from app.services.semantic_cache import SemanticCache
+
+
+def _unit(angle: float):
+    """2-d unit vector at `angle` radians (cosine similarity = cos of the angle between two)."""
+    return [math.cos(angle), math.sin(angle)]
+
+
+def _cache(**kwargs) -> SemanticCache:
+    return SemanticCache(**{"maxsize": 8, "threshold": 0.97, "ttl": 60.0, **kwargs})
+
+
+def test_empty_cache_misses():
+    assert _cache().get(_unit(0.0), top_k=5) is None
+
+
+def test_near_match_hits():
+    cache = _cache()
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+
+    # cos(0.1) ~= 0.995
+    assert cache.get(_unit(0.1), top_k=5) == [{"id": "a"}]
+
+
+def test_distant_query_misses():
+    cache = _cache()
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+
+    # cos(0.3) ~= 0.955, below the threshold
+    assert cache.get(_unit(0.3), top_k=5) is None
+
+
+def test_scale_does_not_matter():
+    cache = _cache()
+    cache.put([3.0, 0.0], 5, [{"id": "a"}])
+
+    assert cache.get([0.5, 0.0], top_k=5) == [{"id": "a"}]
+
+
+def test_different_top_k_misses():
+    cache = _cache()
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+
+    assert cache.get(_unit(0.0), top_k=3) is None
+
+
+def test_mixed_top_k_uses_matching_row():
+    cache = _cache()
+    cache.put(_unit(0.05), 5, [{"id": "top5"}])
+    # Closer to the query, but cached for another top_k
+    cache.put(_unit(0.0), 3, [{"id": "top3"}])
+
+    assert cache.get(_unit(0.0), top_k=5) == [{"id": "top5"}]
+    assert cache.get(_unit(0.0), top_k=3) == [{"id": "top3"}]
+
+
+def test_expired_entries_miss():
+    cache = _cache(ttl=-1.0)
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+
+    assert cache.get(_unit(0.0), top_k=5) is None
+
+
+def test_oldest_entry_is_overwritten_when_full():
+    cache = _cache(maxsize=2)
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+    cache.put(_unit(1.0), 5, [{"id": "b"}])
+    cache.put(_unit(2.0), 5, [{"id": "c"}])
+
+    assert cache.get(_unit(0.0), top_k=5) is None
+    assert cache.get(_unit(1.0), top_k=5) == [{"id": "b"}]
+    assert cache.get(_unit(2.0), top_k=5) == [{"id": "c"}]
+
+
+def test_clear_drops_entries():
+    cache = _cache()
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+    cache.clear()
+
+    assert cache.get(_unit(0.0), top_k=5) is None
+
+
+def test_returned_results_are_a_copy():
+    cache = _cache()
+    cache.put(_unit(0.0), 5, [{"id": "a"}])
+    cache.get(_unit(0.0), top_k=5).append({"id": "b"})
+
+    assert cache.get(_unit(0.0), top_k=5) == [{"id": "a"}]